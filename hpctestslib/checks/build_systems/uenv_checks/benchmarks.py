@@ -353,7 +353,7 @@ class uenv_boot(rfm.RunOnlyRegressionTest,
     def skip_cuda_builds(self):
         if 'cuda' in self.uenv:
             if self.uenv['cuda']:
-                partitions = hpcutil.get_partitions_with_feature_set(['cuda'])
+                partitions = list(hpcutil.get_partitions_with_feature_set(['cuda']))
                 self.skip_if(not partitions,
                              msg='The system does not have any partitions with '
                                  'CUDA support')
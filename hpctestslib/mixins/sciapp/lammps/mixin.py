@@ -8,22 +8,66 @@
 import os
 import re
 import sys
+import types
 
 import reframe as rfm
 import reframe.utility.sanity as sn
-import reframe.utility as util
 
-# Add the root directory of hpctestslib
-prefix = os.path.normpath(
-    os.path.join(os.path.abspath(os.path.dirname(__file__)), *[os.pardir, os.pardir, os.pardir])
-)
-if not prefix in sys.path:
-    sys.path = [prefix] + sys.path
+from reframe.core.exceptions import SanityError
+
+# Add the root directory of hpctestslib; the checks load this mixin as
+# the top-level module mixins.sciapp.lammps.mixin, so util cannot be
+# imported relatively
+prefix = os.path.dirname(os.path.dirname(os.path.dirname(
+    os.path.dirname(os.path.abspath(__file__)))))
+if prefix not in sys.path:
+    sys.path.insert(0, prefix)
 
 
 import util as hpcutil
 
 
+# Thermo output line of the style "Step Temp E_pair E_mol TotEng Press";
+# {ns} is replaced by the number of steps of the simulation. Only the start
+# of the line is anchored, so that LAMMPS versions that print more thermo
+# columns, or separate them with tabs, still match.
+#   100000   0.70239211    -5.6763152      0             -4.6248342    0.70541224
+_THERMO_PATT = r'^\s+{ns}\s+\S+\s+\S+\s+\S+\s+(?P<energy>\S+)\s+\S+'
+
+# Reference energy of each benchmark without and with kokkos, and its
+# tolerance; a None kokkos reference means that both runs use the same one
+_REF = types.MappingProxyType({
+    'adp': (-135742.9, None, 0.001),
+    'comb': (-6.8036753, None, 0.001),
+    'eam': (-106640.77, None, 0.001),
+    'eim': (-97216, None, 0.001),
+    'fene': (22.469024, 22.474714, 0.001),
+    'gb': (3.4067608, 4.6365424, 0.001),
+    'lj': (-4.6223453, None, 0.001),
+    'peri': (449656900.0, 9.4142265e+08, 0.001),
+    'protein': (-25723.2099, -25329.5229, 0.001),
+    'spce': (-111318.84, -110915.58, 0.001),
+    'sw': (-134631.82, None, 0.001),
+    'tersoff': (-144034.65, None, 0.001),
+})
+
+# Total wall time: 0:01:23
+_WALLTIME_RE = re.compile(r'Total wall time: (?P<hour>\d+):(?P<min>\d+):'
+                          r'(?P<sec>\d+)')
+
+
+def _read_output(filename):
+    '''
+    Return the contents of an output file of the run; as with the sn
+    helpers, a file that cannot be read is a sanity error
+    '''
+    try:
+        with open(filename, encoding='utf-8', errors='replace') as fp:
+            return fp.read()
+    except OSError as e:
+        raise SanityError(f'{filename}: {e.strerror}') from e
+
+
 class lammps_mixin(rfm.RegressionTestPlugin):
     '''
     Title: LAMMPS benchmarks mixin
@@ -89,6 +133,33 @@ class lammps_mixin(rfm.RegressionTestPlugin):
     # any change to num steps need to be reflected on the assert functions
     num_steps = 100000
 
+    #: Patterns of the output line holding the final energy of each benchmark.
+    #: ``{ns}`` is replaced by the number of steps in :func:`check_num_steps`
+    _PATTERNS = {
+        'adp': _THERMO_PATT,
+        'comb': r'^\s+{ns}\s+\S+\s+(?P<energy>\S+)\s+\S+\s+\S+\s+\S+',
+        'eam': _THERMO_PATT,
+        'eim': r'^\s+{ns}\s+(?P<energy>\S+)\s+\S+\s+\S+\s+\S+\s+\S+',
+        'fene': _THERMO_PATT,
+        'gb': _THERMO_PATT,
+        'lj': _THERMO_PATT,
+        'peri': _THERMO_PATT,
+        # ---------------- Step   100000 ----- CPU =   ...
+        # TotEng   =    -25723.2099 KinEng   = ...
+        'protein': r'^[-\s]*Step\s+{ns}\s.*\nTotEng\s+=\s+(?P<energy>\S+)',
+        'spce': _THERMO_PATT,
+        'sw': _THERMO_PATT,
+        'tersoff': _THERMO_PATT,
+    }
+
+    #: Compiled energy pattern of the benchmark, or None if it has no entry
+    #: in :attr:`_PATTERNS`, see :func:`check_num_steps`
+    _energy_patt = None
+
+    #: Wall time and final energy matches of the stdout, see
+    #: :func:`_scan_stdout`
+    _stdout_scan = None
+
     @run_after('init')
     def set_executable(self):
         self.executable = 'lmp'
@@ -110,19 +181,37 @@ class lammps_mixin(rfm.RegressionTestPlugin):
         if self.benchmark == 'comb':
             self.num_steps = min(self.num_steps, 500)
 
-    @run_after('init')
+        # compile the energy pattern once the number of steps is final
+        patt = self._PATTERNS.get(self.benchmark)
+        if patt:
+            self._energy_patt = re.compile(patt.format(ns=self.num_steps),
+                                           re.MULTILINE)
+
+    @run_after('init', always_last=True)
     def skip_some_kokkos_benchmarks(self):
         '''
         The peri bechmark does not work with kokkos
         ERROR: KOKKOS package requires a Kokkos-enabled atom_style
+
+        Instead of skipping these tests once they are set up, no system nor
+        programming environment is valid for them, so that ReFrame does not
+        generate their test cases at all. This runs after the init hooks of
+        the tests, which may set the valid systems themselves.
         '''
-        self.skip_if(self.kokkos and self.benchmark in ['peri', 'gb'],
-                     msg='This benchmark cannot be executed with kokkos')
+        if self.kokkos and self.benchmark in ['peri', 'gb']:
+            self.valid_systems = []
+            self.valid_prog_environs = []
 
     @run_before('run', always_last=True)
     def set_omp_num_threads(self):
-        if 'OMP_NUM_THREADS' not in self.env_vars:
-            self.env_vars['OMP_NUM_THREADS'] = self.num_cpus_per_task
+        self.env_vars.setdefault('OMP_NUM_THREADS', self.num_cpus_per_task)
+
+        # the OpenMP back-end of kokkos warns about and runs slower with
+        # unbound threads; these are the settings recommended by the LAMMPS
+        # documentation, unless the test sets its own binding
+        if self.kokkos:
+            self.env_vars.setdefault('OMP_PROC_BIND', 'spread')
+            self.env_vars.setdefault('OMP_PLACES', 'threads')
 
     @run_before('run')
     def set_inputfile(self):
@@ -130,196 +219,110 @@ class lammps_mixin(rfm.RegressionTestPlugin):
 
     @run_before('run')
     def set_kokkos(self):
-        if self.kokkos:
-            self.executable_opts += ['-k', 'on', '-pk', 'kokkos', '-sf', 'kk']
-
-    @run_before('run')
-    def set_download_inputfile_from_lammps_website(self):
-        self.prerun_cmds += [
-            fr'{hpcutil.CURLCMD} -LJO https://www.lammps.org/bench/bench_{self.benchmark}.tar.gz', # noqa: E501
-            fr'{hpcutil.TARCMD} xf bench_{self.benchmark}.tar.gz --strip-components=1 -C {self.stagedir}', # noqa: E501
-            fr"{hpcutil.SEDCMD} -i -e 's/^run.*100/run\t\t{self.num_steps}/g' in.{self.benchmark}" # noqa: E501
-        ]
-
-    @performance_function('s')
-    def time_run(self):
-        walltime = r'Total wall time: (?P<hour>\S+):(?P<min>\S+):(?P<sec>\S+)'
-        hour = sn.extractsingle(walltime, self.stdout, 'hour', int)
-        min = sn.extractsingle(walltime, self.stdout, 'min', int)
-        sec = sn.extractsingle(walltime, self.stdout, 'sec', int)
-        return (hour * 3600) + (min * 60) + sec
-
-    @deferrable
-    def assert_adp(self):
-        energy = sn.extractsingle(fr'^\s+{self.num_steps}\s+(?P<temp>\S+)\s+'
-                                  r'(?P<epair>\S+)\s+(?P<emol>\S+)\s+'
-                                  r'(?P<energy>\S+)\s+(?P<press>\S+)',
-                                  self.stdout, 'energy', float, item=-1)
-        ref_energy = -135742.9
-        thres_energy = 0.001
-        return sn.all([
-            sn.assert_reference(energy, ref_energy, -thres_energy, thres_energy)
-        ])
+        if not self.kokkos:
+            return
 
+        # without 'g', a kokkos build for GPUs runs on the CPUs only
+        opts = ['-k', 'on']
+        if self.num_gpus_per_node:
+            opts += ['g', str(self.num_gpus_per_node)]
 
-    @deferrable
-    def assert_comb(self):
-        energy = sn.extractsingle(fr'^\s+{self.num_steps}\s+(?P<temp>\S+)\s+'
-                                  r'(?P<energy>\S+)\s+(?P<pot>\S+)\s+'
-                                  r'(?P<vdw>\S+)\s+(?P<coul>\S+)',
-                                  self.stdout, 'energy', float, item=-1)
-        ref_energy = -6.8036753
-        thres_energy = 0.001
-        return sn.all([
-            sn.assert_reference(energy, ref_energy, -thres_energy, thres_energy)
-        ])
+        if self.num_cpus_per_task:
+            opts += ['t', str(self.num_cpus_per_task)]
 
-    @deferrable
-    def assert_eam(self):
-        energy = sn.extractsingle(fr'^\s+{self.num_steps}\s+(?P<temp>\S+)\s+'
-                                  r'(?P<epair>\S+)\s+(?P<emol>\S+)\s+'
-                                  r'(?P<energy>\S+)\s+(?P<press>\S+)',
-                                  self.stdout, 'energy', float, item=-1)
-        ref_energy = -106640.77
-        thres_energy = 0.001
-        return sn.all([
-            sn.assert_reference(energy, ref_energy, -thres_energy, thres_energy)
-        ])
+        opts += ['-pk', 'kokkos']
+        if not self.num_gpus_per_node:
+            # on CPUs, half neighbor lists with newton on avoid computing
+            # the pairwise forces twice
+            opts += ['newton', 'on', 'neigh', 'half']
 
-    @deferrable
-    def assert_eim(self):
-        energy = sn.extractsingle(fr'^\s+{self.num_steps}\s+(?P<energy>\S+)\s+'
-                                  r'(?P<pxx>\S+)\s+(?P<pyy>\S+)\s+(?P<pzz>\S+)'
-                                  r'\s+(?P<temp>\S+)',
-                                  self.stdout, 'energy', float, item=-1)
-        ref_energy = -97216
-        thres_energy = 0.001
-        return sn.all([
-            sn.assert_reference(energy, ref_energy, -thres_energy, thres_energy)
-        ])
+        self.executable_opts += opts + ['-sf', 'kk']
 
-    @deferrable
-    def assert_fene(self):
-        energy = sn.extractsingle(fr'^\s+{self.num_steps}\s+(?P<temp>\S+)\s+'
-                                  r'(?P<epair>\S+)\s+(?P<emol>\S+)\s+'
-                                  r'(?P<energy>\S+)\s+(?P<press>\S+)',
-                                  self.stdout, 'energy', float, item=-1)
-        ref_energy = 22.469024
-        if self.kokkos:
-            ref_energy = 22.474714
-        thres_energy = 0.001
-        return sn.all([
-            sn.assert_reference(energy, ref_energy, -thres_energy, thres_energy)
-        ])
+    @run_before('run')
+    def set_download_inputfile_from_lammps_website(self):
+        # do not download nor extract the benchmark again if it is already
+        # in the stage directory; the tarball is only kept once it has been
+        # fully downloaded and the number of steps is patched into the input
+        # file only when it is freshly extracted
+        self.prerun_cmds += [
+            fr'test -f bench_{self.benchmark}.tar.gz || {{ {hpcutil.CURLCMD} -fL -o bench_{self.benchmark}.tar.gz.part https://www.lammps.org/bench/bench_{self.benchmark}.tar.gz && mv bench_{self.benchmark}.tar.gz.part bench_{self.benchmark}.tar.gz; }}', # noqa: E501
+            fr"test -f in.{self.benchmark} || {{ {hpcutil.TARCMD} xf bench_{self.benchmark}.tar.gz --strip-components=1 -C {self.stagedir} && {hpcutil.SEDCMD} -i -e 's/^run.*100/run\t\t{self.num_steps}/g' in.{self.benchmark}; }}" # noqa: E501
+        ]
 
-    @deferrable
-    def assert_gb(self):
-        energy = sn.extractsingle(fr'^\s+{self.num_steps}\s+(?P<temp>\S+)\s+'
-                                  r'(?P<epair>\S+)\s+(?P<emol>\S+)\s+'
-                                  r'(?P<energy>\S+)\s+(?P<press>\S+)',
-                                  self.stdout, 'energy', float, item=-1)
-        ref_energy = 3.4067608
-        if self.kokkos:
-            ref_energy = 4.6365424
+    def _scan_stdout(self):
+        '''
+        Read the stdout of the run once and return the match of the wall time
+        and the match of the final energy, or None for any of them that could
+        not be found. Both the sanity and the performance checks reuse the
+        result.
+        '''
+        if self._stdout_scan is None:
+            if self._energy_patt is None:
+                raise SanityError(
+                    f'cannot extract energy from benchmark '
+                    f'{self.benchmark!r}: please add its pattern to '
+                    f'"_PATTERNS"'
+                )
 
-        thres_energy = 0.001
-        return sn.all([
-            sn.assert_reference(energy, ref_energy, -thres_energy, thres_energy)
-        ])
+            data = _read_output(sn.evaluate(self.stdout))
+            energy = None
+            for energy in self._energy_patt.finditer(data):
+                pass
 
-    @deferrable
-    def assert_lj(self):
-        energy = sn.extractsingle(fr'^\s+{self.num_steps}\s+(?P<temp>\S+)\s+'
-                                  r'(?P<epair>\S+)\s+(?P<emol>\S+)\s+'
-                                  r'(?P<energy>\S+)\s+(?P<press>\S+)',
-                                  self.stdout, 'energy', float, item=-1)
-        ref_energy = -4.6223453
-        thres_energy = 0.001
-        return sn.all([
-            sn.assert_reference(energy, ref_energy, -thres_energy, thres_energy)
-        ])
+            self._stdout_scan = (_WALLTIME_RE.search(data), energy)
 
-    @deferrable
-    def assert_peri(self):
-        energy = sn.extractsingle(fr'^\s+{self.num_steps}\s+(?P<temp>\S+)\s+'
-                                  r'(?P<epair>\S+)\s+(?P<emol>\S+)\s+'
-                                  r'(?P<energy>\S+)\s+(?P<press>\S+)',
-                                  self.stdout, 'energy', float, item=-1)
-        ref_energy = 449656900.0
-        if self.kokkos:
-            ref_energy = 9.4142265e+08
-        thres_energy = 0.001
-        return sn.all([
-            sn.assert_reference(energy, ref_energy, -thres_energy, thres_energy)
-        ])
+        return self._stdout_scan
 
-    @deferrable
-    def assert_protein(self):
-        energy = sn.extractsingle(fr'.*Step\s+{self.num_steps}.*\nTotEng\s+=\s+'
-                                  r'(?P<energy>\S+)',
-                                  self.stdout, 'energy', float, item=-1)
-        ref_energy = -25723.2099
-        if self.kokkos:
-            ref_energy = -25329.5229
+    @performance_function('s')
+    def time_run(self):
+        walltime, _ = self._scan_stdout()
+        if walltime is None:
+            raise SanityError(f'pattern {_WALLTIME_RE.pattern!r} not found in '
+                              f'{sn.evaluate(self.stdout)!r}')
 
-        thres_energy = 0.001
-        return sn.all([
-            sn.assert_reference(energy, ref_energy, -thres_energy, thres_energy)
-        ])
+        hour, min, sec = map(int, walltime.group('hour', 'min', 'sec'))
+        return (hour * 3600) + (min * 60) + sec
 
     @deferrable
-    def assert_spce(self):
-        energy = sn.extractsingle(fr'^\s+{self.num_steps}\s+(?P<temp>\S+)\s+'
-                                  r'(?P<epair>\S+)\s+(?P<emol>\S+)\s+'
-                                  r'(?P<energy>\S+)\s+(?P<press>\S+)',
-                                  self.stdout, 'energy', float, item=-1)
-        ref_energy = -111318.84
-        if self.kokkos:
-            ref_energy = -110915.58
+    def _assert_energy(self):
+        ref_energy, ref_energy_kk, thres_energy = _REF[self.benchmark]
+        if self.kokkos and ref_energy_kk is not None:
+            ref_energy = ref_energy_kk
 
-        thres_energy = 0.001
-        return sn.all([
-            sn.assert_reference(energy, ref_energy, -thres_energy, thres_energy)
-        ])
+        _, energy = self._scan_stdout()
+        if energy is None:
+            raise SanityError(f'pattern {self._energy_patt.pattern!r} not '
+                              f'found in {sn.evaluate(self.stdout)!r}')
 
-    @deferrable
-    def assert_sw(self):
-        energy = sn.extractsingle(fr'^\s+{self.num_steps}\s+(?P<temp>\S+)\s+'
-                                  r'(?P<epair>\S+)\s+(?P<emol>\S+)\s+'
-                                  r'(?P<energy>\S+)\s+(?P<press>\S+)',
-                                  self.stdout, 'energy', float, item=-1)
-        ref_energy = -134631.82
-        thres_energy = 0.001
-        return sn.all([
-            sn.assert_reference(energy, ref_energy, -thres_energy, thres_energy)
-        ])
+        return sn.assert_reference(float(energy.group('energy')), ref_energy,
+                                   -thres_energy, thres_energy)
 
     @deferrable
-    def assert_tersoff(self):
-        energy = sn.extractsingle(fr'^\s+{self.num_steps}\s+(?P<temp>\S+)\s+'
-                                  r'(?P<epair>\S+)\s+(?P<emol>\S+)\s+'
-                                  r'(?P<energy>\S+)\s+(?P<press>\S+)',
-                                  self.stdout, 'energy', float, item=-1)
-        ref_energy = -144034.65
-        thres_energy = 0.001
-        return sn.all([
-            sn.assert_reference(energy, ref_energy, -thres_energy, thres_energy)
-        ])
+    def _assert_no_segfault(self):
+        # a plain substring search is enough for a fixed message
+        stderr = sn.evaluate(self.stderr)
+        return sn.assert_true(
+            'Segmentation fault' not in _read_output(stderr),
+            msg=f"'Segmentation fault' found in {stderr!r}"
+        )
 
     @sanity_function
     def assert_sanity(self):
         '''Assert that the obtained energy meets the benchmark tolerances.'''
 
-        assert_fn_name = f'assert_{util.toalphanum(self.benchmark).lower()}'
-        assert_fn = getattr(self, assert_fn_name, None)
         sn.assert_true(
-            assert_fn is not None,
-            msg=(f'cannot extract energy from benchmark {self.benchmark!r}: '
-                 f'please define a member function "{assert_fn_name}()"')
+            self.benchmark in _REF,
+            msg=(f'cannot check energy of benchmark {self.benchmark!r}: '
+                 f'please add its reference energy to "_REF"')
         ).evaluate()
 
+        walltime, _ = self._scan_stdout()
         return sn.chain(
-                sn.assert_found('Total wall time', self.stdout),
-                sn.assert_not_found('Segmentation fault', self.stderr),
-                assert_fn(),
+                sn.assert_true(
+                    walltime is not None,
+                    msg=(f"'Total wall time' not found in "
+                         f"{sn.evaluate(self.stdout)!r}")
+                ),
+                self._assert_no_segfault(),
+                self._assert_energy(),
             )
@@ -5,25 +5,173 @@
 
 
 # import datetime
+import collections
+import contextlib
+import mmap
 import os
 import re
 import sys
 
 import reframe as rfm
 import reframe.utility.sanity as sn
-import reframe.utility as util
 
-# Add the root directory of hpctestslib
-prefix = os.path.normpath(
-    os.path.join(os.path.abspath(os.path.dirname(__file__)), *[os.pardir, os.pardir, os.pardir])
-)
-if not prefix in sys.path:
-    sys.path = [prefix] + sys.path
+# Add the root directory of hpctestslib; the checks load this mixin as
+# the top-level module mixins.sciapp.nwchem.mixin, so the inputs cannot be
+# imported relatively
+prefix = os.path.dirname(os.path.dirname(os.path.dirname(
+    os.path.dirname(os.path.abspath(__file__)))))
+if prefix not in sys.path:
+    sys.path.insert(0, prefix)
 
 
 # import mixin as nwchem
 import mixins.sciapp.nwchem.inputs as inputs
 
+from reframe.core.exceptions import SanityError
+
+
+# Convergence on energy requested:  1.00D-06
+_ENER_THRES_RE = re.compile(r'Convergence\s+on\s+energy\s+requested:\s+'
+                            r'(?P<ener_thres>\S+)')
+
+# Convergence threshold     :          1.000E-06
+_SCF_THRES_RE = re.compile(r'Convergence\s+threshold\s+:\s+(?P<scf_thres>\S+)')
+
+# Total DFT energy =     -124.098908887656
+_TOTAL_DFT_RE = re.compile(r'Total\s+DFT\s+energy\s+=\s+(?P<total_dft>\S+)')
+
+# Total SCF energy =   -683.365261303407
+_TOTAL_SCF_RE = re.compile(r'Total\s+SCF\s+energy\s+=\s+(?P<total_scf>\S+)')
+
+# One-electron energy =   -2607.299805379243
+_ONE_E_RE = re.compile(r'One-electron\s+energy\s+=\s+(?P<one_e>\S+)')
+
+# Two-electron energy =     1084.575687920973
+_TWO_E_RE = re.compile(r'Two-electron\s+energy\s+=\s+(?P<two_e>\S+)')
+
+# Coulomb energy =     1170.814029607174
+_COUL_RE = re.compile(r'Coulomb\s+energy\s+=\s+(?P<coul>\S+)')
+
+# Exchange-Corr. energy =      -88.647358711313
+_EXCHANGE_CORR_RE = re.compile(r'Exchange-Corr\.\s+energy\s+=\s+'
+                               r'(?P<exchange_corr>\S+)')
+
+# Nuclear repulsion energy =     839.358856154863
+_NUC_REP_RE = re.compile(r'Nuclear\s+repulsion\s+energy\s+=\s+'
+                         r'(?P<nuc_rep>\S+)')
+
+# COSMO energy =       10.391162812557
+_COSMO_RE = re.compile(r'COSMO\s+energy\s+=\s+(?P<cosmo>\S+)')
+
+# delta internal energy  =         0.002297456656
+_DELTA_INT_RE = re.compile(r'delta\s+internal\s+energy\s+=\s+'
+                           r'(?P<delta_int>\S+)')
+
+# dielectric constant -eps-     =  78.40
+_DIEL_RE = re.compile(r'dielectric\s+constant\s+-eps-\s+=\s+(?P<diel>\S+)')
+
+# Ground state a1       -124.098908887656 a.u.
+_GROUND_A1_RE = re.compile(r'Ground\s+state\s+a1\s+(?P<ground_a1>\S+)')
+
+# Excited state energy =   -123.838371032320
+_EXC_STATE_RE = re.compile(r'Excited\s+state\s+energy\s+=\s+'
+                           r'(?P<exc_state>\S+)')
+
+# Total Entropy                    =   48.055 cal/mol-K
+_ENTROPY_RE = re.compile(r'Total\s+Entropy\s+=\s+(?P<entropy>\S+)')
+
+# Root   1 singlet a              0.221049320 a.u.                6.0151 eV
+_ROOT_RE = re.compile(r'Root\s+(?P<root_num>\d+)\s+singlet\s+a\s+\S+\s+'
+                      r'a\.u\.\s+(?P<root>\S+)\s+eV')
+
+# Kin. energy (a.u.):        1            0.020377
+_QMD_KIN_RE = re.compile(r'Kin\.\s+energy\s+\(a\.u\.\):\s+'
+                         r'(?P<qmd_kin_step>\d+)\s+(?P<qmd_kin>\S+)')
+
+# Pot. energy (a.u.):        1         -686.441152
+_QMD_POT_RE = re.compile(r'Pot\.\s+energy\s+\(a\.u\.\):\s+'
+                         r'(?P<qmd_pot_step>\d+)\s+(?P<qmd_pot>\S+)')
+
+# Tot. energy (a.u.):        1         -686.420775
+_QMD_TOT_RE = re.compile(r'Tot\.\s+energy\s+\(a\.u\.\):\s+'
+                         r'(?P<qmd_tot_step>\d+)\s+(?P<qmd_tot>\S+)')
+
+# wavefunction    = RHF
+_WAVEFN_RE = re.compile(r'wavefunction\s+=\s+(?P<wavefn>\S+)')
+
+#  Frequency         -1.38       -1.20       -0.78        0.26        0.77        1.19
+#
+# Only lines starting with Frequency are taken, not the P.Frequency lines of
+# the projected frequencies; the newline before the line is matched instead
+# of a ^ anchor, so that the pattern still starts with a literal
+_FREQUENCY_RE = re.compile(r'\n *Frequency(?P<frequency>(?: +\S+){6}) *$',
+                           re.MULTILINE)
+
+# Total times  cpu:        2.0s     wall:        3.6s
+_PERF_RE = re.compile(rb'Total\s+times\s+cpu:\s+[^\ss]+s\s+wall:\s+'
+                      rb'(?P<perf>[^\ss]+)s')
+
+
+# All the fields of the output checked by the sanity functions; the group
+# of each pattern is named after its field. It is a bytes pattern, so that
+# it runs directly on the memory mapped stdout.
+_FIELDS_RE = re.compile(b'|'.join(regex.pattern.encode() for regex in [
+    _ENER_THRES_RE,
+    _SCF_THRES_RE,
+    _TOTAL_DFT_RE,
+    _TOTAL_SCF_RE,
+    _ONE_E_RE,
+    _TWO_E_RE,
+    _COUL_RE,
+    _EXCHANGE_CORR_RE,
+    _NUC_REP_RE,
+    _COSMO_RE,
+    _DELTA_INT_RE,
+    _DIEL_RE,
+    _GROUND_A1_RE,
+    _EXC_STATE_RE,
+    _ENTROPY_RE,
+    _ROOT_RE,
+    _QMD_KIN_RE,
+    _QMD_POT_RE,
+    _QMD_TOT_RE,
+    _WAVEFN_RE,
+    _FREQUENCY_RE,
+]), re.MULTILINE)
+
+# The fields whose lines are numbered, by the group of the number; their
+# values are kept by (field, number), e.g. ('root', 2) for the energies of
+# the second root
+_NUMBERED_FIELDS = {
+    'root': 'root_num',
+    'qmd_kin': 'qmd_kin_step',
+    'qmd_pot': 'qmd_pot_step',
+    'qmd_tot': 'qmd_tot_step',
+}
+
+
+@contextlib.contextmanager
+def _map_output(filename):
+    '''
+    Memory map an output file of the run for reading; an empty file, which
+    cannot be mapped, is given as b''. As with the sn helpers, a file that
+    cannot be read is a sanity error.
+    '''
+    try:
+        with open(filename, 'rb') as fp:
+            if os.fstat(fp.fileno()).st_size:
+                data = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+            else:
+                data = b''
+    except OSError as e:
+        raise SanityError(f'{filename}: {e.strerror}') from e
+
+    try:
+        yield data
+    finally:
+        if isinstance(data, mmap.mmap):
+            data.close()
+
 
 class nwchem_mixin(rfm.RegressionTestPlugin):
     '''
@@ -78,6 +226,176 @@ class nwchem_mixin(rfm.RegressionTestPlugin):
         # 'water_dimer',
     ])
 
+    #: Sanity function of each benchmark
+    _ASSERT_FNS = {
+        'bf_tddft_freq': 'assert_bf_tddft_freq',
+        'cf3coo-_cosmo': 'assert_cf3coo__cosmo',
+        'glucose': 'assert_glucose',
+        'glucose_ccsd': 'assert_glucose_ccsd',
+        'glucose_cosmo': 'assert_glucose_cosmo',
+        'glucose_dft': 'assert_glucose_dft',
+        'glucose_freq': 'assert_glucose_freq',
+        'glucose_opt': 'assert_glucose_opt',
+        'glucose_qmd': 'assert_glucose_qmd',
+        # 'glucose_tce': 'assert_glucose_tce',
+        'glucose_tddft': 'assert_glucose_tddft',
+        'heme6a1': 'assert_heme6a1',
+        'water_dimer': 'assert_water_dimer',
+    }
+
+    # The reference tables below list (field of the stdout, item, reference)
+    # tuples; item selects the occurrence of the field, like in
+    # sn.extractsingle. Numbered fields are given as (field, number), see
+    # _NUMBERED_FIELDS.
+
+    _BF_TDDFT_FREQ_REFS = (
+        # Total DFT energy =     -124.098908887656
+        ('total_dft', 0, -124.098908887656),
+        # Total DFT energy =     -124.100428853875
+        ('total_dft', -1, -124.100428853875),
+        # Ground state a1       -124.098908887656 a.u.
+        ('ground_a1', 0, -124.098908887656),
+        # Excited state energy =   -123.838371032320
+        ('exc_state', 0, -123.838371032320),
+        # Excited state energy =   -123.853064317425
+        ('exc_state', -1, -123.853064317425),
+    )
+
+    _CF3COO__COSMO_REFS = (
+        # Total DFT energy =     -526.161913505093
+        ('total_dft', -1, -526.161913505093),
+        # COSMO energy =       10.391162812557
+        ('cosmo', -1, 10.391162812557),
+        #  delta internal energy  =         0.002297456656
+        ('delta_int', -1, 0.002297456656),
+    )
+
+    _GLUCOSE_SCF_REFS = (
+        # Total SCF energy =   -683.365261303407
+        ('total_scf', -1, -683.365261303407),
+        # One-electron energy =   -2607.299805379243
+        ('one_e', -1, -2607.299805379243),
+        # Two-electron energy =     1084.575687920973
+        ('two_e', -1, 1084.575687920973),
+        # Nuclear repulsion energy =     839.358856154863
+        ('nuc_rep', -1, 839.358856154863),
+    )
+
+    # TODO: check also the one-electron (-2608.958022321022), Coulomb
+    # (1170.814029607174), exchange-correlation (-88.647358711313) and nuclear
+    # repulsion (839.358856154863) energies of this benchmark
+    _GLUCOSE_COSMO_REFS = (
+        # Total DFT energy =      -686.949838350192
+        ('total_dft', -1, -686.949838350192),
+        # COSMO energy =       0.482656920106
+        ('cosmo', -1, 0.482656920106),
+        #  delta internal energy  =         0.007176549622
+        ('delta_int', -1, 0.007176549622),
+    )
+
+    _GLUCOSE_DFT_REFS = (
+        # Total DFT energy =      -686.440956331395
+        ('total_dft', -1, -686.440956331395),
+        # One-electron energy =   -2608.477645956119
+        ('one_e', -1, -2608.477645956119),
+        # Coulomb energy =     1170.815188573782
+        ('coul', -1, 1170.815188573782),
+        # Exchange-Corr. energy =      -88.137355103922
+        ('exchange_corr', -1, -88.137355103922),
+        # Nuclear repulsion energy =     839.358856154863
+        ('nuc_rep', -1, 839.358856154863),
+    )
+
+    _GLUCOSE_OPT_REFS = (
+        # Total SCF energy =   -683.365261338948
+        ('total_scf', -1, -683.365261338948),
+        # One-electron energy =   -2607.302073824297
+        ('one_e', -1, -2607.302073824297),
+        # Two-electron energy =     1084.576726849307
+        ('two_e', -1, 1084.576726849307),
+        # Nuclear repulsion energy =     839.360085636041
+        ('nuc_rep', -1, 839.360085636041),
+    )
+
+    _GLUCOSE_QMD_REFS = (
+        # Total DFT energy =      -686.440956335001
+        ('total_dft', -1, -686.440956335001),
+        # One-electron energy =   -2608.477631366763
+        ('one_e', -1, -2608.477631366763),
+        # Coulomb energy =     1170.815171236917
+        ('coul', -1, 1170.815171236917),
+        # Exchange-Corr. energy =      -88.137352360019
+        ('exchange_corr', -1, -88.137352360019),
+        # Nuclear repulsion energy =     839.358856154863
+        ('nuc_rep', -1, 839.358856154863),
+    )
+
+    # The energies of the QMD steps, by step number
+    _GLUCOSE_QMD_PROP_REFS = (
+        # Kin. energy (a.u.):        1            0.020377
+        (('qmd_kin', 1), 0, 0.020377),
+        # Pot. energy (a.u.):        1         -686.441152
+        (('qmd_pot', 1), 0, -686.441152),
+        # Tot. energy (a.u.):        1         -686.420775
+        (('qmd_tot', 1), 0, -686.420775),
+        # Kin. energy (a.u.):        2            0.020121
+        (('qmd_kin', 2), 0, 0.020121),
+        # Pot. energy (a.u.):        2         -686.441302
+        (('qmd_pot', 2), 0, -686.441302),
+        # Tot. energy (a.u.):        2         -686.421181
+        (('qmd_tot', 2), 0, -686.421181),
+    )
+
+    _GLUCOSE_TDDFT_REFS = (
+        # Total DFT energy =      -681.838002892225
+        ('total_dft', -1, -681.838002892225),
+        # One-electron energy =   -2608.211733648903
+        ('one_e', -1, -2608.211733648903),
+        # Coulomb energy =     1170.306810114574
+        ('coul', -1, 1170.306810114574),
+        # Exchange-Corr. energy =      -83.291935512760
+        ('exchange_corr', -1, -83.291935512760),
+        # Nuclear repulsion energy =     839.358856154863
+        ('nuc_rep', -1, 839.358856154863),
+    )
+
+    # The energies of the roots, in eV, by root number
+    _GLUCOSE_TDDFT_ROOT_REFS = (
+        # Root   1 singlet a              0.221049320 a.u.                6.0151 eV
+        (('root', 1), 0, 6.0151),
+        # Root   2 singlet a              0.232001505 a.u.                6.3131 eV
+        (('root', 2), 0, 6.3131),
+        # Root   3 singlet a              0.238526339 a.u.                6.4906 eV
+        (('root', 3), 0, 6.4906),
+    )
+
+    _HEME6A1_REFS = (
+        # Total SCF energy =  -2545.183109542068
+        ('total_scf', -1, -2545.183109542068),
+    )
+
+    _WATER_DIMER_REFS = (
+        # Total SCF energy =   -151.187952037914
+        ('total_scf', -1, -151.1879),
+        # One-electron energy =   -283.055720556525
+        ('one_e', -1, -283.0557),
+        # Two-electron energy =     94.692634711216
+        ('two_e', -1, 94.6926),
+        # Nuclear repulsion energy =     37.175133807395
+        ('nuc_rep', -1, 37.1751),
+    )
+
+    # First and last line of the frequencies of glucose_freq
+    _GLUCOSE_FREQS_FIRST = frozenset(
+        ['-1.38', '-1.20', '-0.78', '0.26', '0.77', '1.19']
+    )
+    _GLUCOSE_FREQS_LAST = frozenset(
+        ['3269.19', '4144.68', '4158.18', '4163.37', '4165.07', '4180.19']
+    )
+
+    #: Values of the fields of the stdout, see :func:`_stdout_fields`
+    _fields = None
+
     @run_after('init')
     def set_executable(self):
         self.executable = 'nwchem'
@@ -91,542 +409,183 @@ class nwchem_mixin(rfm.RegressionTestPlugin):
     def set_descr(self):
         self.descr = f'NWCHEM {self.benchmark} benchmark'
 
+    @run_after('init')
+    def _set_input_name(self):
+        self._input_name = f'{self.benchmark}.nw'
+
     @run_before('run')
     def set_input_file(self):
-        self.executable_opts += [f'{self.benchmark}.nw']
+        self.executable_opts += [self._input_name]
 
     @run_before('run')
     def set_keep_files(self):
-        self.keep_files += [f'{self.benchmark}.nw']
+        self.keep_files += [self._input_name]
 
     @run_before('run')
     def create_inpufile(self):
-        create_fn_name = f'input_{util.toalphanum(self.benchmark).lower()}'
-        create_input_fn = getattr(self, create_fn_name, None)
+        contents = inputs.INPUT_FILES.get(self.benchmark)
         sn.assert_true(
-            create_input_fn is not None,
+            contents is not None,
             msg=(f'cannot create input file for benchmark {self.benchmark!r}: '
-                 f'please define a member function "{create_fn_name}()"')
+                 f'please add it to "inputs.CASES"')
         ).evaluate()
 
-        input_file = os.path.join(sn.evaluate(self.stagedir),
-                                  f'{self.benchmark}.nw')
-        create_input_fn(input_file)
-
-    def input_bf_tddft_freq(self, input_file):
-        with open(input_file, 'w') as f:
-            f.write(inputs.INPUT_FILE_TEMPLATE.safe_substitute(
-                name='bf_tddft_freq',
-                title='CIS/6-31G* BF optimization frequencies',
-                geometry='\n'.join(inputs.BF),
-                basis='\n'.join(inputs.BS_631GS),
-                computation='\n'.join(inputs.CISTDDFTOPTFREQ),
-            ))
-
-    def input_cf3coo__cosmo(self, input_file):
-        with open(input_file, 'w') as f:
-            f.write(inputs.INPUT_FILE_TEMPLATE.safe_substitute(
-                name='cf3coo__cosmo',
-                title='M06-2X solvation free energy for CF3COO- in water',
-                geometry='\n'.join(inputs.CF3COO_),
-                basis='\n'.join(inputs.BS_631GS),
-                computation='\n'.join(inputs.nwchem.COSMO),
-            ))
-
-    def input_glucose(self, input_file):
-        with open(input_file, 'w') as f:
-            f.write(inputs.INPUT_FILE_TEMPLATE.safe_substitute(
-                name='glucose',
-                title='Hartree-Fock SCF Calculation on Alpha-D-Glucose',
-                geometry='\n'.join(inputs.GLUCOSE),
-                basis='\n'.join(inputs.BS_631GSS),
-                computation='\n'.join(inputs.HFSCF),
-            ))
-
-    def input_glucose_ccsd(self, input_file):
-        with open(input_file, 'w') as f:
-            f.write(inputs.INPUT_FILE_TEMPLATE.safe_substitute(
-                name='glucose_ccsd',
-                title='CCSD Calculation on Alpha-D-Glucose',
-                geometry='\n'.join(inputs.GLUCOSE),
-                basis='\n'.join(inputs.BS_631GSS),
-                computation='\n'.join(inputs.CCSD),
-            ))
-
-    def input_glucose_cosmo(self, input_file):
-        with open(input_file, 'w') as f:
-            f.write(inputs.INPUT_FILE_TEMPLATE.safe_substitute(
-                name='glucose_cosmo',
-                title='DFT M06-2x Calculation on Alpha-D-Glucose in COSMO water',
-                geometry='\n'.join(inputs.GLUCOSE),
-                basis='\n'.join(inputs.BS_631GSS),
-                computation='\n'.join(inputs.COSMO),
-            ))
-
-    def input_glucose_dft(self, input_file):
-        with open(input_file, 'w') as f:
-            f.write(inputs.INPUT_FILE_TEMPLATE.safe_substitute(
-                name='glucose_dft',
-                title='DFT PBE0 Calculation on Alpha-D-Glucose',
-                geometry='\n'.join(inputs.GLUCOSE),
-                basis='\n'.join(inputs.BS_631GSS),
-                computation='\n'.join(inputs.PBEDFT),
-            ))
-
-    def input_glucose_freq(self, input_file):
-        with open(input_file, 'w') as f:
-            f.write(inputs.INPUT_FILE_TEMPLATE.safe_substitute(
-                name='glucose_freq',
-                title='Hartree-Fock Opt and Freq Calculation on Alpha-D-Glucose',
-                geometry='\n'.join(inputs.GLUCOSE),
-                basis='\n'.join(inputs.BS_631GSS),
-                computation='\n'.join(inputs.HFSCFOPTFREQ),
-            ))
-
-    def input_glucose_opt(self, input_file):
-        with open(input_file, 'w') as f:
-            f.write(inputs.INPUT_FILE_TEMPLATE.safe_substitute(
-                name='glucose_opt',
-                title='Hartree-Fock Opt Calculation on Alpha-D-Glucose',
-                geometry='\n'.join(inputs.GLUCOSE),
-                basis='\n'.join(inputs.BS_631GSS),
-                computation='\n'.join(inputs.HFSCFOPT),
-            ))
-
-    def input_glucose_qmd(self, input_file):
-        with open(input_file, 'w') as f:
-            f.write(inputs.INPUT_FILE_TEMPLATE.safe_substitute(
-                name='glucose_qmd',
-                title='PBE0 QMD Calculation on Alpha-D-Glucose',
-                geometry='\n'.join(inputs.GLUCOSE),
-                basis='\n'.join(inputs.BS_631GSS),
-                computation='\n'.join(inputs.PBEQMD),
-            ))
-
-    # # TODO: uncomment this function
-    # def input_glucose_tce(self, input_file):
-    #     with open(input_file, 'w') as f:
-    #         f.write(inputs.INPUT_FILE_TEMPLATE.safe_substitute(
-    #             name='glucose_tce',
-    #             title='CISD Calculation on Alpha-D-Glucose',
-    #             geometry='\n'.join(inputs.GLUCOSE),
-    #             basis='\n'.join(inputs.BS_631GSS),
-    #             computation='\n'.join(inputs.CISD),
-    #         ))
-
-    def input_glucose_tddft(self, input_file):
-        with open(input_file, 'w') as f:
-            f.write(inputs.INPUT_FILE_TEMPLATE.safe_substitute(
-                name='glucose_tddft',
-                title='TDDFT Calculation on Alpha-D-Glucose',
-                geometry='\n'.join(inputs.GLUCOSE),
-                basis='\n'.join(inputs.BS_631GSS),
-                computation='\n'.join(inputs.TDDFT),
-            ))
-
-    def input_heme6a1(self, input_file):
-        with open(input_file, 'w') as f:
-            f.write(inputs.INPUT_FILE_TEMPLATE.safe_substitute(
-                name='heme6a1',
-                title='SCF based on Fragments Calculation on heme-H2O complex',
-                geometry='\n'.join(inputs.HEME),
-                basis='\n'.join(inputs.HEMEBS),
-                computation='\n'.join(inputs.HEMETASK),
-            ))
-
-    def input_water_dimer(self, input_file):
-        with open(input_file, 'w') as f:
-            f.write(inputs.INPUT_FILE_TEMPLATE.safe_substitute(
-                name='waterdimer',
-                title='SCF based on Fragments Calculation on water dimer',
-                geometry='\n'.join(inputs.WATERDIMER),
-                basis='\n'.join(inputs.BS_321G),
-                computation='\n'.join(inputs.WATERDIMERTASK),
-            ))
+        input_file = os.path.join(self.stagedir, self._input_name)
+        # the contents are already encoded, so write them without going
+        # through a text file object
+        fd = os.open(input_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            data = memoryview(contents)
+            while data:
+                data = data[os.write(fd, data):]
+        finally:
+            os.close(fd)
+
+    def _stdout_fields(self):
+        '''
+        Scan the memory mapped stdout once and return the values of all the
+        fields of _FIELDS_RE by field name, in order of appearance. Only the
+        values are decoded. The result is reused by every sanity check of
+        the test.
+        '''
+        if self._fields is None:
+            fields = collections.defaultdict(list)
+            with _map_output(sn.evaluate(self.stdout)) as stdout:
+                for match in _FIELDS_RE.finditer(stdout):
+                    name = match.lastgroup
+                    value = match.group(name).decode()
+                    num_group = _NUMBERED_FIELDS.get(name)
+                    if num_group:
+                        num = int(match.group(num_group))
+                        fields[name, num].append(value)
+                    else:
+                        fields[name].append(value)
+
+            self._fields = fields
+
+        return self._fields
+
+    def _field_value(self, name, conv=None, item=0):
+        '''
+        Return the value of a field of the stdout, like sn.extractsingle but
+        right away; the helpers that need the value at once use it instead of
+        evaluating a deferred _field.
+        '''
+        try:
+            value = self._stdout_fields()[name][item]
+        except IndexError:
+            raise SanityError(f'not enough values of {name!r} in '
+                              f'{sn.evaluate(self.stdout)!r} so as to '
+                              f'extract item {item!r}')
+
+        return conv(value) if conv else value
+
+    @deferrable
+    def _field(self, name, conv=None, item=0):
+        '''Return the value of a field of the stdout, like sn.extractsingle'''
+        return self._field_value(name, conv, item)
 
     @performance_function('s')
     def perf(self):
-        # Total times  cpu:        2.0s     wall:        3.6s
-        return sn.extractsingle(r'Total\s+times\s+cpu:\s+\S+s\s+wall:\s+'
-                                r'(?P<perf>\S+)s',
-                                self.stdout, 'perf', float, -1)
+        # The timings are printed at the very end of the output, so the last
+        # of them is searched backwards from the end of the file, trying the
+        # pattern only where the line could start
+        stdout_path = sn.evaluate(self.stdout)
+        with _map_output(stdout_path) as stdout:
+            pos = stdout.rfind(b'Total')
+            while pos >= 0:
+                match = _PERF_RE.match(stdout, pos)
+                if match:
+                    return float(match.group('perf'))
+
+                pos = stdout.rfind(b'Total', 0, pos)
+
+        raise SanityError(f'pattern {_PERF_RE.pattern!r} not found in '
+                          f'{stdout_path!r}')
 
     @deferrable
-    def assert_bf_tddft_freq(self):
-        # Convergence on energy requested:  1.00D-06
-        ener_thres = sn.extractsingle(r'Convergence\s+on\s+energy\s+'
-                                      r'requested:\s+(?P<thres>\S+)',
-                                      self.stdout, 'thres',
-                                      item=-1)
+    def _assert_energies(self, refs, ener_thres):
+        '''
+        Assert the energies of the run against a table of references. The
+        relative tolerance of each energy is ener_thres over its reference,
+        the same as an absolute tolerance of ener_thres, so all the energies
+        are compared in one go instead of building an assertion for each.
+        '''
+        ener_thres = abs(ener_thres)
+        failed = []
+        for name, item, ref in refs:
+            energy = self._field_value(name, float, item)
+            if abs(energy - ref) > ener_thres:
+                failed.append(f'{name}[{item}] = {energy} (reference {ref})')
+
+        return sn.assert_false(
+            failed,
+            msg=(f'energies off their reference by more than {ener_thres}: '
+                 f'{", ".join(failed)}')
+        )
+
+    def _dft_ener_thres(self):
+        '''Return the energy convergence threshold of the DFT runs'''
 
-        ener_thres = sn.evaluate(ener_thres).replace('D', 'E')
-        ener_thres = float(ener_thres)
-
-        # Total DFT energy =     -124.098908887656
-        total_dft_energy_start = sn.extractsingle(r'Total\s+DFT\s+energy\s+=\s+'
-                                            r'(?P<energy>\S+)',
-                                            self.stdout, 'energy', float,
-                                            item=0)
-        ref_total_dft_energy_start = -124.098908887656
-        thres_total_dft_energy_start = abs(ener_thres / ref_total_dft_energy_start)
-
-        # Total DFT energy =     -124.100428853875
-        total_dft_energy_end = sn.extractsingle(r'Total\s+DFT\s+energy\s+=\s+'
-                                            r'(?P<energy>\S+)',
-                                            self.stdout, 'energy', float,
-                                            item=-1)
-        ref_total_dft_energy_end = -124.100428853875
-        thres_total_dft_energy_end = abs(ener_thres / ref_total_dft_energy_end)
-
-        # Ground state a1       -124.098908887656 a.u.
-        ground_state_a1_start = sn.extractsingle(r'Ground\s+state\s+a1\s+'
-                                                r'(?P<energy>\S+)',
-                                                self.stdout, 'energy', float,
-                                                item=0)
-        ref_ground_state_a1_start = -124.098908887656
-        thres_ground_state_a1_start = abs(ener_thres / ref_ground_state_a1_start)
-
-        # Excited state energy =   -123.838371032320
-        exc_state_ener_start = sn.extractsingle(r'Excited\s+state\s+energy\s+='
-                                                r'\s+(?P<energy>\S+)',
-                                                self.stdout, 'energy', float,
-                                                item=0)
-        ref_exc_state_ener_start = -123.838371032320
-        thres_exc_state_ener_start = abs(ener_thres / ref_exc_state_ener_start)
-
-        # Excited state energy =   -123.853064317425
-        exc_state_ener_end = sn.extractsingle(r'Excited\s+state\s+energy\s+='
-                                                r'\s+(?P<energy>\S+)',
-                                                self.stdout, 'energy', float,
-                                                item=-1)
-        ref_exc_state_ener_end = -123.853064317425
-        thres_exc_state_ener_end = abs(ener_thres / ref_exc_state_ener_end)
-
-        # Total Entropy                    =   48.055 cal/mol-K
-        total_entropy = sn.extractsingle(r'Total\s+Entropy\s+=\s+'
-                                                r'(?P<energy>\S+)',
-                                                self.stdout, 'energy', float,
-                                                item=-1)
-        ref_total_entropy = 48.055
-        thres_total_entropy = abs(1E-3 / ref_total_entropy)
+        # Convergence on energy requested:  1.00D-06
+        ener_thres = self._field_value('ener_thres', item=-1)
+        return float(ener_thres.replace('D', 'E'))
 
+    @deferrable
+    def assert_bf_tddft_freq(self):
         return sn.all([
-            sn.assert_reference(total_dft_energy_start, ref_total_dft_energy_start,
-                                -thres_total_dft_energy_start, thres_total_dft_energy_start),
-            sn.assert_reference(total_dft_energy_end, ref_total_dft_energy_end,
-                                -thres_total_dft_energy_end, thres_total_dft_energy_end),
-            sn.assert_reference(ground_state_a1_start, ref_ground_state_a1_start,
-                                -thres_ground_state_a1_start, thres_ground_state_a1_start),
-            sn.assert_eq(total_dft_energy_start, ground_state_a1_start,
-                         msg=f'First ground state energy {total_dft_energy_start} different from the DFT energy {ground_state_a1_start}'),
-            sn.assert_reference(exc_state_ener_start, ref_exc_state_ener_start,
-                                -thres_exc_state_ener_start, thres_exc_state_ener_start),
-            sn.assert_reference(exc_state_ener_end, ref_exc_state_ener_end,
-                                -thres_exc_state_ener_end, thres_exc_state_ener_end),
+            self._assert_energies(self._BF_TDDFT_FREQ_REFS,
+                                  self._dft_ener_thres()),
+            sn.assert_eq(self._field('total_dft', float),
+                         self._field('ground_a1', float),
+                         msg='First ground state energy {1} different from '
+                             'the DFT energy {0}'),
             sn.assert_found('Vibrational analysis via the FX method', self.stdout),
             sn.assert_found('Linear Molecule', self.stdout),
-            sn.assert_reference(total_entropy, ref_total_entropy,
-                                -thres_total_entropy, thres_total_entropy),
+            # Total Entropy                    =   48.055 cal/mol-K
+            self._assert_energies([('entropy', -1, 48.055)], 1E-3),
         ])
 
     @deferrable
-    def assert_cf3coo__cosmo(self):
-        # Convergence on energy requested:  1.00D-06
-        ener_thres = sn.extractsingle(r'Convergence\s+on\s+energy\s+'
-                                      r'requested:\s+(?P<thres>\S+)',
-                                      self.stdout, 'thres',
-                                      item=-1)
-
-        ener_thres = sn.evaluate(ener_thres).replace('D', 'E')
-        ener_thres = float(ener_thres)
-
-        # Total DFT energy =     -526.161913505093
-        total_dft_energy = sn.extractsingle(r'Total\s+DFT\s+energy\s+=\s+'
-                                            r'(?P<energy>\S+)',
-                                            self.stdout, 'energy', float,
-                                            item=-1)
-        ref_total_dft_energy = -526.161913505093
-        thres_total_dft_energy = abs(ener_thres / ref_total_dft_energy)
-
-        # COSMO energy =       10.391162812557
-        cosmo_energy = sn.extractsingle(r'COSMO\s+energy\s+=\s+'
-                                            r'(?P<energy>\S+)',
-                                            self.stdout, 'energy', float,
-                                            item=-1)
-        ref_cosmo_energy = 10.391162812557
-        thres_cosmo_energy = abs(ener_thres / ref_cosmo_energy)
-
-        #  delta internal energy  =         0.002297456656
-        delta_internal_ener = sn.extractsingle(r'delta\s+internal\s+energy\s+=\s+'
-                                            r'(?P<energy>\S+)',
-                                            self.stdout, 'energy', float,
-                                            item=-1)
-        ref_delta_internal_ener = 0.002297456656
-        thres_delta_internal_ener = abs(ener_thres / ref_delta_internal_ener)
-
+    def _assert_cosmo(self, refs):
         # dielectric constant -eps-     =  78.40
-        dielectric_const = sn.extractsingle(r'dielectric\s+constant\s+-eps-\s+=\s+'
-                                            r'(?P<const>\S+)',
-                                            self.stdout, 'const', float)
         ref_dielectric_const = 78.40
-
         return sn.all([
-            sn.assert_reference(total_dft_energy, ref_total_dft_energy,
-                                -thres_total_dft_energy, thres_total_dft_energy),
-            sn.assert_reference(cosmo_energy, ref_cosmo_energy,
-                                -thres_cosmo_energy, thres_cosmo_energy),
-            sn.assert_reference(delta_internal_ener, ref_delta_internal_ener,
-                                -thres_delta_internal_ener, thres_delta_internal_ener),
-            sn.assert_eq(dielectric_const, ref_dielectric_const,
+            self._assert_energies(refs, self._dft_ener_thres()),
+            sn.assert_eq(self._field('diel', float), ref_dielectric_const,
                          msg=f'Dielectric constant is not {ref_dielectric_const}')
         ])
 
     @deferrable
-    def assert_glucose(self):
-        # Convergence threshold     :          1.000E-06
-        ener_thres = sn.extractsingle(r'Convergence\s+threshold\s+:\s+'
-                                      r'(?P<thres>\S+)',
-                                      self.stdout, 'thres', float,
-                                      item=-1)
-
-
-        # Total SCF energy =   -683.365261303407
-        total_scf_energy = sn.extractsingle(r'Total\s+SCF\s+energy\s+=\s+'
-                                            r'(?P<energy>\S+)',
-                                            self.stdout, 'energy', float,
-                                            item=-1)
-        ref_total_scf_energy = -683.365261303407
-        thres_total_scf_energy = abs(ener_thres / ref_total_scf_energy)
-
-        # One-electron energy =   -2607.299805379243
-        one_e_energy = sn.extractsingle(r'One-electron\s+energy\s+=\s+'
-                                        r'(?P<energy>\S+)',
-                                        self.stdout, 'energy', float,
-                                        item=-1)
-        ref_one_e_energy = -2607.299805379243
-        thres_one_e_energy = abs(ener_thres / ref_one_e_energy)
-
-        # Two-electron energy =     1084.575687920973
-        two_e_energy = sn.extractsingle(r'Two-electron\s+energy\s+=\s+'
-                                        r'(?P<energy>\S+)',
-                                        self.stdout, 'energy', float,
-                                        item=-1)
-        ref_two_e_energy = 1084.575687920973
-        thres_two_e_energy = abs(ener_thres / ref_two_e_energy)
-
-        # Nuclear repulsion energy =     839.358856154863
-        nuc_rep_energy = sn.extractsingle(r'Nuclear\s+repulsion\s+energy\s+=\s+'
-                                        r'(?P<energy>\S+)',
-                                        self.stdout, 'energy', float,
-                                        item=-1)
-        ref_nuc_rep_energy = 839.358856154863
-        thres_nuc_rep_energy = abs(ener_thres / ref_nuc_rep_energy)
+    def assert_cf3coo__cosmo(self):
+        return self._assert_cosmo(self._CF3COO__COSMO_REFS)
 
-        return sn.all([
-            sn.assert_reference(total_scf_energy, ref_total_scf_energy,
-                                -thres_total_scf_energy, thres_total_scf_energy),
-            sn.assert_reference(one_e_energy, ref_one_e_energy,
-                                -thres_one_e_energy, thres_one_e_energy),
-            sn.assert_reference(two_e_energy, ref_two_e_energy,
-                                -thres_two_e_energy, thres_two_e_energy),
-            sn.assert_reference(nuc_rep_energy, ref_nuc_rep_energy,
-                                -thres_nuc_rep_energy, thres_nuc_rep_energy),
-        ])
+    @deferrable
+    def _assert_scf_energies(self, refs):
+        # Convergence threshold     :          1.000E-06
+        ener_thres = self._field_value('scf_thres', float, item=-1)
+        return self._assert_energies(refs, ener_thres)
 
     @deferrable
+    def assert_glucose(self):
+        return self._assert_scf_energies(self._GLUCOSE_SCF_REFS)
+
     def assert_glucose_ccsd(self):
+        # there are no checks on the output of this benchmark yet, so there is
+        # nothing to defer
         return True
 
-    # TODO: check the unused variables in this function
     @deferrable
     def assert_glucose_cosmo(self):
-        # Convergence on energy requested:  1.00D-06
-        ener_thres = sn.extractsingle(r'Convergence\s+on\s+energy\s+'
-                                      r'requested:\s+(?P<thres>\S+)',
-                                      self.stdout, 'thres',
-                                      item=-1)
-
-        ener_thres = sn.evaluate(ener_thres).replace('D', 'E')
-        ener_thres = float(ener_thres)
-
-        # Total DFT energy =      -686.949838350192
-        total_dft_energy = sn.extractsingle(r'Total\s+DFT\s+energy\s+=\s+'
-                                            r'(?P<energy>\S+)',
-                                            self.stdout, 'energy', float,
-                                            item=-1)
-        ref_total_dft_energy = -686.949838350192
-        thres_total_dft_energy = abs(ener_thres / ref_total_dft_energy)
-
-        # One-electron energy =   -2608.958022321022
-        one_e_energy = sn.extractsingle(r'One-electron\s+energy\s+=\s+'
-                                        r'(?P<energy>\S+)',
-                                        self.stdout, 'energy', float,
-                                        item=-1)
-        ref_one_e_energy = -2608.958022321022
-        thres_one_e_energy = abs(ener_thres / ref_one_e_energy)
-
-        # Coulomb energy =     1170.814029607174
-        coul_energy = sn.extractsingle(r'Coulomb\s+energy\s+=\s+'
-                                        r'(?P<energy>\S+)',
-                                        self.stdout, 'energy', float,
-                                        item=-1)
-        ref_coul_energy = 1170.814029607174
-        thres_coul_energy = abs(ener_thres / ref_coul_energy)
-
-        # Exchange-Corr. energy =      -88.647358711313
-        exchange_corr = sn.extractsingle(r'Exchange-Corr.\s+energy\s+=\s+'
-                                        r'(?P<energy>\S+)',
-                                        self.stdout, 'energy', float,
-                                        item=-1)
-        ref_exchange_corr = -88.647358711313
-        thres_exchange_corr = abs(ener_thres / ref_exchange_corr)
-
-        # Nuclear repulsion energy =     839.358856154863
-        nuc_rep_energy = sn.extractsingle(r'Nuclear\s+repulsion\s+energy\s+=\s+'
-                                        r'(?P<energy>\S+)',
-                                        self.stdout, 'energy', float,
-                                        item=-1)
-        ref_nuc_rep_energy = 839.358856154863
-        thres_nuc_rep_energy = abs(ener_thres / ref_nuc_rep_energy)
-
-        # COSMO energy =       0.482656920106
-        cosmo_energy = sn.extractsingle(r'COSMO\s+energy\s+=\s+'
-                                            r'(?P<energy>\S+)',
-                                            self.stdout, 'energy', float,
-                                            item=-1)
-        ref_cosmo_energy = 0.482656920106
-        thres_cosmo_energy = abs(ener_thres / ref_cosmo_energy)
-
-        #  delta internal energy  =         0.007176549622
-        delta_internal_ener = sn.extractsingle(r'delta\s+internal\s+energy\s+=\s+'
-                                            r'(?P<energy>\S+)',
-                                            self.stdout, 'energy', float,
-                                            item=-1)
-        ref_delta_internal_ener = 0.007176549622
-        thres_delta_internal_ener = abs(ener_thres / ref_delta_internal_ener)
-
-        # dielectric constant -eps-     =  78.40
-        dielectric_const = sn.extractsingle(r'dielectric\s+constant\s+-eps-\s+=\s+'
-                                            r'(?P<const>\S+)',
-                                            self.stdout, 'const', float)
-        ref_dielectric_const = 78.40
-
-        return sn.all([
-            sn.assert_reference(total_dft_energy, ref_total_dft_energy,
-                                -thres_total_dft_energy, thres_total_dft_energy),
-            sn.assert_reference(cosmo_energy, ref_cosmo_energy,
-                                -thres_cosmo_energy, thres_cosmo_energy),
-            sn.assert_reference(delta_internal_ener, ref_delta_internal_ener,
-                                -thres_delta_internal_ener, thres_delta_internal_ener),
-            sn.assert_eq(dielectric_const, ref_dielectric_const,
-                         msg=f'Dielectric constant is not {ref_dielectric_const}')
-        ])
+        return self._assert_cosmo(self._GLUCOSE_COSMO_REFS)
 
     @deferrable
     def assert_glucose_dft(self):
-        # Convergence on energy requested:  1.00D-06
-        ener_thres = sn.extractsingle(r'Convergence\s+on\s+energy\s+'
-                                      r'requested:\s+(?P<thres>\S+)',
-                                      self.stdout, 'thres',
-                                      item=-1)
-
-        ener_thres = sn.evaluate(ener_thres).replace('D', 'E')
-        ener_thres = float(ener_thres)
-
-        # Total DFT energy =      -686.440956331395
-        total_dft_energy = sn.extractsingle(r'Total\s+DFT\s+energy\s+=\s+'
-                                            r'(?P<energy>\S+)',
-                                            self.stdout, 'energy', float,
-                                            item=-1)
-        ref_total_dft_energy = -686.440956331395
-        thres_total_dft_energy = abs(ener_thres / ref_total_dft_energy)
-
-        # One-electron energy =   -2608.477645956119
-        one_e_energy = sn.extractsingle(r'One-electron\s+energy\s+=\s+'
-                                        r'(?P<energy>\S+)',
-                                        self.stdout, 'energy', float,
-                                        item=-1)
-        ref_one_e_energy = -2608.477645956119
-        thres_one_e_energy = abs(ener_thres / ref_one_e_energy)
-
-        # Coulomb energy =     1170.815188573782
-        coul_energy = sn.extractsingle(r'Coulomb\s+energy\s+=\s+'
-                                        r'(?P<energy>\S+)',
-                                        self.stdout, 'energy', float,
-                                        item=-1)
-        ref_coul_energy = 1170.815188573782
-        thres_coul_energy = abs(ener_thres / ref_coul_energy)
-
-        # Exchange-Corr. energy =      -88.137355103922
-        exchange_corr = sn.extractsingle(r'Exchange-Corr.\s+energy\s+=\s+'
-                                        r'(?P<energy>\S+)',
-                                        self.stdout, 'energy', float,
-                                        item=-1)
-        ref_exchange_corr = -88.137355103922
-        thres_exchange_corr = abs(ener_thres / ref_exchange_corr)
-
-        # Nuclear repulsion energy =     839.358856154863
-        nuc_rep_energy = sn.extractsingle(r'Nuclear\s+repulsion\s+energy\s+=\s+'
-                                        r'(?P<energy>\S+)',
-                                        self.stdout, 'energy', float,
-                                        item=-1)
-        ref_nuc_rep_energy = 839.358856154863
-        thres_nuc_rep_energy = abs(ener_thres / ref_nuc_rep_energy)
-
-        return sn.all([
-            sn.assert_reference(total_dft_energy, ref_total_dft_energy,
-                                -thres_total_dft_energy, thres_total_dft_energy),
-            sn.assert_reference(one_e_energy, ref_one_e_energy,
-                                -thres_one_e_energy, thres_one_e_energy),
-            sn.assert_reference(coul_energy, ref_coul_energy,
-                                -thres_coul_energy, thres_coul_energy),
-            sn.assert_reference(exchange_corr, ref_exchange_corr,
-                                -thres_exchange_corr, thres_exchange_corr),
-            sn.assert_reference(nuc_rep_energy, ref_nuc_rep_energy,
-                                -thres_nuc_rep_energy, thres_nuc_rep_energy),
-        ])
+        return self._assert_energies(self._GLUCOSE_DFT_REFS,
+                                     self._dft_ener_thres())
 
     @deferrable
     def assert_glucose_freq(self):
-        # Convergence threshold     :          1.000E-06
-        ener_thres = sn.extractsingle(r'Convergence\s+threshold\s+:\s+'
-                                      r'(?P<thres>\S+)',
-                                      self.stdout, 'thres', float,
-                                      item=-1)
-
-
-        # Total SCF energy =   -683.365261303407
-        total_scf_energy = sn.extractsingle(r'Total\s+SCF\s+energy\s+=\s+'
-                                            r'(?P<energy>\S+)',
-                                            self.stdout, 'energy', float,
-                                            item=-1)
-        ref_total_scf_energy = -683.365261303407
-        thres_total_scf_energy = abs(ener_thres / ref_total_scf_energy)
-
-        # One-electron energy =   -2607.299805379243
-        one_e_energy = sn.extractsingle(r'One-electron\s+energy\s+=\s+'
-                                        r'(?P<energy>\S+)',
-                                        self.stdout, 'energy', float,
-                                        item=-1)
-        ref_one_e_energy = -2607.299805379243
-        thres_one_e_energy = abs(ener_thres / ref_one_e_energy)
-
-        # Two-electron energy =     1084.575687920973
-        two_e_energy = sn.extractsingle(r'Two-electron\s+energy\s+=\s+'
-                                        r'(?P<energy>\S+)',
-                                        self.stdout, 'energy', float,
-                                        item=-1)
-        ref_two_e_energy = 1084.575687920973
-        thres_two_e_energy = abs(ener_thres / ref_two_e_energy)
-
-        # Nuclear repulsion energy =     839.358856154863
-        nuc_rep_energy = sn.extractsingle(r'Nuclear\s+repulsion\s+energy\s+=\s+'
-                                        r'(?P<energy>\S+)',
-                                        self.stdout, 'energy', float,
-                                        item=-1)
-        ref_nuc_rep_energy = 839.358856154863
-        thres_nuc_rep_energy = abs(ener_thres / ref_nuc_rep_energy)
-
         # I know, I know we are not in a minimum.
         # All the frequencies have to be positive, but I am not doing science
         # with this geometry. I just need to find out if NWChem is working properly
@@ -643,218 +602,42 @@ class nwchem_mixin(rfm.RegressionTestPlugin):
         #  Frequency       1558.28     1564.57     1581.33     1588.00     1605.82     1641.42
         #  Frequency       3117.82     3156.14     3204.08     3221.96     3239.87     3265.77
         #  Frequency       3269.19     4144.68     4158.18     4163.37     4165.07     4180.19
-        frequencies = sn.findall(r'^\s+Frequency\s+(?P<all>(?:\s+(?P<one>\S+))'
-                                 r'{6})$',
-                                self.stdout)
+        frequencies = self._stdout_fields()['frequency']
 
-        freqs_one = re.findall(r"(?P<one>\S+)",
-                               sn.evaluate(frequencies[0]).group("all"))
+        sn.assert_eq(len(frequencies), 12,
+                     msg='Could not find all the 72 frequencies').evaluate()
 
-        freqs_last = re.findall(r"(?P<one>\S+)",
-                               sn.evaluate(frequencies[-1]).group("all"))
+        freqs_one = frequencies[0].split()
+        freqs_last = frequencies[-1].split()
 
         # We could check all numbers, but a few checks should suffice
-        ref_freqs_one = set(['-1.38', '-1.20', '-0.78', '0.26', '0.77', '1.19'])
-        ref_freqs_last = set(['3269.19', '4144.68', '4158.18', '4163.37', '4165.07', '4180.19'])
-
-        diff_freqs_one = ref_freqs_one.difference(set(freqs_one))
-        diff_freqs_last = ref_freqs_last.difference(set(freqs_last))
+        diff_freqs_one = self._GLUCOSE_FREQS_FIRST.difference(freqs_one)
+        diff_freqs_last = self._GLUCOSE_FREQS_LAST.difference(freqs_last)
 
         return sn.all([
-            sn.assert_reference(total_scf_energy, ref_total_scf_energy,
-                                -thres_total_scf_energy, thres_total_scf_energy),
-            sn.assert_reference(one_e_energy, ref_one_e_energy,
-                                -thres_one_e_energy, thres_one_e_energy),
-            sn.assert_reference(two_e_energy, ref_two_e_energy,
-                                -thres_two_e_energy, thres_two_e_energy),
-            sn.assert_reference(nuc_rep_energy, ref_nuc_rep_energy,
-                                -thres_nuc_rep_energy, thres_nuc_rep_energy),
-            sn.assert_eq(sn.count(frequencies), 12,
-                         msg='Could not find all the 72 frequencies'),
+            self._assert_scf_energies(self._GLUCOSE_SCF_REFS),
             sn.assert_false(diff_freqs_one,
-                            msg=f'Found frequencies {diff_freqs_one} that were '
-                                 'not supposed to be there'),
+                            msg=f'Could not find the frequencies '
+                                f'{", ".join(sorted(diff_freqs_one))} '
+                                f'in the first line'),
             sn.assert_false(diff_freqs_last,
-                            msg=f'Found frequencies {diff_freqs_last} that were '
-                                 'not supposed to be there'),
+                            msg=f'Could not find the frequencies '
+                                f'{", ".join(sorted(diff_freqs_last))} '
+                                f'in the last line'),
         ])
 
     @deferrable
     def assert_glucose_opt(self):
-        # Convergence threshold     :          1.000E-06
-        ener_thres = sn.extractsingle(r'Convergence\s+threshold\s+:\s+'
-                                      r'(?P<thres>\S+)',
-                                      self.stdout, 'thres', float,
-                                      item=-1)
-
-        # Total SCF energy =   -683.365261338948
-        total_scf_energy = sn.extractsingle(r'Total\s+SCF\s+energy\s+=\s+'
-                                            r'(?P<energy>\S+)',
-                                            self.stdout, 'energy', float,
-                                            item=-1)
-        ref_total_scf_energy = -683.365261338948
-        thres_total_scf_energy = abs(ener_thres / ref_total_scf_energy)
-
-        # One-electron energy =   -2607.302073824297
-        one_e_energy = sn.extractsingle(r'One-electron\s+energy\s+=\s+'
-                                        r'(?P<energy>\S+)',
-                                        self.stdout, 'energy', float,
-                                        item=-1)
-        ref_one_e_energy = -2607.302073824297
-        thres_one_e_energy = abs(ener_thres / ref_one_e_energy)
-
-        # Two-electron energy =     1084.576726849307
-        two_e_energy = sn.extractsingle(r'Two-electron\s+energy\s+=\s+'
-                                        r'(?P<energy>\S+)',
-                                        self.stdout, 'energy', float,
-                                        item=-1)
-        ref_two_e_energy = 1084.576726849307
-        thres_two_e_energy = abs(ener_thres / ref_two_e_energy)
-
-        # Nuclear repulsion energy =     839.360085636041
-        nuc_rep_energy = sn.extractsingle(r'Nuclear\s+repulsion\s+energy\s+=\s+'
-                                        r'(?P<energy>\S+)',
-                                        self.stdout, 'energy', float,
-                                        item=-1)
-        ref_nuc_rep_energy = 839.360085636041
-        thres_nuc_rep_energy = abs(ener_thres / ref_nuc_rep_energy)
-
-        return sn.all([
-            sn.assert_reference(total_scf_energy, ref_total_scf_energy,
-                                -thres_total_scf_energy, thres_total_scf_energy),
-            sn.assert_reference(one_e_energy, ref_one_e_energy,
-                                -thres_one_e_energy, thres_one_e_energy),
-            sn.assert_reference(two_e_energy, ref_two_e_energy,
-                                -thres_two_e_energy, thres_two_e_energy),
-            sn.assert_reference(nuc_rep_energy, ref_nuc_rep_energy,
-                                -thres_nuc_rep_energy, thres_nuc_rep_energy),
-        ])
+        return self._assert_scf_energies(self._GLUCOSE_OPT_REFS)
 
     @deferrable
     def assert_glucose_qmd(self):
-        # Convergence on energy requested:  1.00D-06
-        ener_thres = sn.extractsingle(r'Convergence\s+on\s+energy\s+'
-                                      r'requested:\s+(?P<thres>\S+)',
-                                      self.stdout, 'thres',
-                                      item=-1)
-
-        ener_thres = sn.evaluate(ener_thres).replace('D', 'E')
-        ener_thres = float(ener_thres)
-
-        # Total DFT energy =      -686.440956335001
-        total_dft_energy = sn.extractsingle(r'Total\s+DFT\s+energy\s+=\s+'
-                                            r'(?P<energy>\S+)',
-                                            self.stdout, 'energy', float,
-                                            item=-1)
-        ref_total_dft_energy = -686.440956335001
-        thres_total_dft_energy = abs(ener_thres / ref_total_dft_energy)
-
-        # One-electron energy =   -2608.477631366763
-        one_e_energy = sn.extractsingle(r'One-electron\s+energy\s+=\s+'
-                                        r'(?P<energy>\S+)',
-                                        self.stdout, 'energy', float,
-                                        item=-1)
-        ref_one_e_energy = -2608.477631366763
-        thres_one_e_energy = abs(ener_thres / ref_one_e_energy)
-
-        # Coulomb energy =     1170.815171236917
-        coul_energy = sn.extractsingle(r'Coulomb\s+energy\s+=\s+'
-                                        r'(?P<energy>\S+)',
-                                        self.stdout, 'energy', float,
-                                        item=-1)
-        ref_coul_energy = 1170.815171236917
-        thres_coul_energy = abs(ener_thres / ref_coul_energy)
-
-        # Exchange-Corr. energy =      -88.137352360019
-        exchange_corr = sn.extractsingle(r'Exchange-Corr.\s+energy\s+=\s+'
-                                        r'(?P<energy>\S+)',
-                                        self.stdout, 'energy', float,
-                                        item=-1)
-        ref_exchange_corr = -88.137352360019
-        thres_exchange_corr = abs(ener_thres / ref_exchange_corr)
-
-        # Nuclear repulsion energy =     839.358856154863
-        nuc_rep_energy = sn.extractsingle(r'Nuclear\s+repulsion\s+energy\s+=\s+'
-                                        r'(?P<energy>\S+)',
-                                        self.stdout, 'energy', float,
-                                        item=-1)
-        ref_nuc_rep_energy = 839.358856154863
-        thres_nuc_rep_energy = abs(ener_thres / ref_nuc_rep_energy)
-
         # this is an arbritary number I have defined
         qmd_prop_prec = 1e-4
-
-        # Kin. energy (a.u.):        1            0.020377
-        kin_ene_step1 = sn.extractsingle(r'Kin.\s+energy\s+\(a.u.\)):\s+1\s+'
-                                        r'(?P<energy>\S+)',
-                                        self.stdout, 'energy', float,
-                                        item=0)
-        ref_kin_ene_step1 = 0.020377
-        thres_kin_ene_step1 = abs(qmd_prop_prec / ref_kin_ene_step1)
-
-        # Pot. energy (a.u.):        1         -686.441152
-        pot_ene_step1 = sn.extractsingle(r'Pot.\s+energy\s+\(a.u.\)):\s+1\s+'
-                                        r'(?P<energy>\S+)',
-                                        self.stdout, 'energy', float,
-                                        item=0)
-        ref_pot_ene_step1 = -686.441152
-        thres_pot_ene_step1 = abs(qmd_prop_prec / ref_pot_ene_step1)
-
-        # Tot. energy (a.u.):        1         -686.420775
-        tot_ene_step1 = sn.extractsingle(r'Tot.\s+energy\s+\(a.u.\)):\s+1\s+'
-                                        r'(?P<energy>\S+)',
-                                        self.stdout, 'energy', float,
-                                        item=0)
-        ref_tot_ene_step1 = -686.420775
-        thres_tot_ene_step1 = abs(qmd_prop_prec / ref_tot_ene_step1)
-
-        # Kin. energy (a.u.):        2            0.020121
-        kin_ene_step2 = sn.extractsingle(r'Kin.\s+energy\s+\(a.u.\)):\s+2\s+'
-                                        r'(?P<energy>\S+)',
-                                        self.stdout, 'energy', float,
-                                        item=0)
-        ref_kin_ene_step2 = 0.020121
-        thres_kin_ene_step2 = abs(qmd_prop_prec / ref_kin_ene_step2)
-
-        # Pot. energy (a.u.):        2         -686.441302
-        pot_ene_step2 = sn.extractsingle(r'Pot.\s+energy\s+\(a.u.\)):\s+2\s+'
-                                        r'(?P<energy>\S+)',
-                                        self.stdout, 'energy', float,
-                                        item=0)
-        ref_pot_ene_step2 = -686.441302
-        thres_pot_ene_step2 = abs(qmd_prop_prec / ref_pot_ene_step2)
-
-        # Tot. energy (a.u.):        2         -686.421181
-        tot_ene_step2 = sn.extractsingle(r'Tot.\s+energy\s+\(a.u.\)):\s+2\s+'
-                                        r'(?P<energy>\S+)',
-                                        self.stdout, 'energy', float,
-                                        item=0)
-        ref_tot_ene_step2 = -686.421181
-        thres_tot_ene_step2 = abs(qmd_prop_prec / ref_tot_ene_step2)
-
         return sn.all([
-            sn.assert_reference(total_dft_energy, ref_total_dft_energy,
-                                -thres_total_dft_energy, thres_total_dft_energy),
-            sn.assert_reference(one_e_energy, ref_one_e_energy,
-                                -thres_one_e_energy, thres_one_e_energy),
-            sn.assert_reference(coul_energy, ref_coul_energy,
-                                -thres_coul_energy, thres_coul_energy),
-            sn.assert_reference(exchange_corr, ref_exchange_corr,
-                                -thres_exchange_corr, thres_exchange_corr),
-            sn.assert_reference(nuc_rep_energy, ref_nuc_rep_energy,
-                                -thres_nuc_rep_energy, thres_nuc_rep_energy),
-            sn.assert_reference(kin_ene_step1, ref_kin_ene_step1,
-                                -thres_kin_ene_step1, thres_kin_ene_step1),
-            sn.assert_reference(pot_ene_step1, ref_pot_ene_step1,
-                                -thres_pot_ene_step1, thres_pot_ene_step1),
-            sn.assert_reference(tot_ene_step1, ref_tot_ene_step1,
-                                -thres_tot_ene_step1, thres_tot_ene_step1),
-            sn.assert_reference(kin_ene_step2, ref_kin_ene_step2,
-                                -thres_kin_ene_step2, thres_kin_ene_step2),
-            sn.assert_reference(pot_ene_step2, ref_pot_ene_step2,
-                                -thres_pot_ene_step2, thres_pot_ene_step2),
-            sn.assert_reference(tot_ene_step2, ref_tot_ene_step2,
-                                -thres_tot_ene_step2, thres_tot_ene_step2),
+            self._assert_energies(self._GLUCOSE_QMD_REFS,
+                                  self._dft_ener_thres()),
+            self._assert_energies(self._GLUCOSE_QMD_PROP_REFS, qmd_prop_prec),
         ])
 
     # # TODO: write the sanity function
@@ -864,135 +647,21 @@ class nwchem_mixin(rfm.RegressionTestPlugin):
 
     @deferrable
     def assert_glucose_tddft(self):
-        # Convergence on energy requested:  1.00D-06
-        ener_thres = sn.extractsingle(r'Convergence\s+on\s+energy\s+'
-                                      r'requested:\s+(?P<thres>\S+)',
-                                      self.stdout, 'thres',
-                                      item=-1)
-
-        ener_thres = sn.evaluate(ener_thres).replace('D', 'E')
-        ener_thres = float(ener_thres)
-
-        # Total DFT energy =      -681.838002892225
-        total_dft_energy = sn.extractsingle(r'Total\s+DFT\s+energy\s+=\s+'
-                                            r'(?P<energy>\S+)',
-                                            self.stdout, 'energy', float,
-                                            item=-1)
-        ref_total_dft_energy = -681.838002892225
-        thres_total_dft_energy = abs(ener_thres / ref_total_dft_energy)
-
-        # One-electron energy =   -2608.211733648903
-        one_e_energy = sn.extractsingle(r'One-electron\s+energy\s+=\s+'
-                                        r'(?P<energy>\S+)',
-                                        self.stdout, 'energy', float,
-                                        item=-1)
-        ref_one_e_energy = -2608.211733648903
-        thres_one_e_energy = abs(ener_thres / ref_one_e_energy)
-
-        # Coulomb energy =     1170.306810114574
-        coul_energy = sn.extractsingle(r'Coulomb\s+energy\s+=\s+'
-                                        r'(?P<energy>\S+)',
-                                        self.stdout, 'energy', float,
-                                        item=-1)
-        ref_coul_energy = 1170.306810114574
-        thres_coul_energy = abs(ener_thres / ref_coul_energy)
-
-        # Exchange-Corr. energy =      -83.291935512760
-        exchange_corr = sn.extractsingle(r'Exchange-Corr.\s+energy\s+=\s+'
-                                        r'(?P<energy>\S+)',
-                                        self.stdout, 'energy', float,
-                                        item=-1)
-        ref_exchange_corr = -83.291935512760
-        thres_exchange_corr = abs(ener_thres / ref_exchange_corr)
-
-        # Nuclear repulsion energy =     839.358856154863
-        nuc_rep_energy = sn.extractsingle(r'Nuclear\s+repulsion\s+energy\s+=\s+'
-                                        r'(?P<energy>\S+)',
-                                        self.stdout, 'energy', float,
-                                        item=-1)
-        ref_nuc_rep_energy = 839.358856154863
-        thres_nuc_rep_energy = abs(ener_thres / ref_nuc_rep_energy)
-
         # this is an arbritary number I have defined
         tddft_prec = 1e-3
-
-        # Root   1 singlet a              0.221049320 a.u.                6.0151 eV
-        root_one_ene = sn.extractsingle(r'Root\s+1\s+singlet\s+a\s+\S+\s+\S+\s+'
-                                        r'(?P<energy>\S+)\s+eV',
-                                        self.stdout, 'energy', float,
-                                        item=0)
-        ref_root_one_ene = 6.0151
-        thres_root_one_ene = abs(tddft_prec / ref_root_one_ene)
-
-        # Root   2 singlet a              0.232001505 a.u.                6.3131 eV
-        root_two_ene = sn.extractsingle(r'Root\s+2\s+singlet\s+a\s+\S+\s+\S+\s+'
-                                         r'(?P<energy>\S+)\s+eV',
-                                        self.stdout, 'energy', float,
-                                        item=0)
-        ref_root_two_ene = 6.3131
-        thres_root_two_ene = abs(tddft_prec / ref_root_two_ene)
-
-        # Root   3 singlet a              0.238526339 a.u.                6.4906 eV
-        root_three_ene = sn.extractsingle(r'Root\s+3\s+singlet\s+a\s+\S+\s+\S+\s+'
-                                         r'(?P<energy>\S+)\s+eV',
-                                        self.stdout, 'energy', float,
-                                        item=0)
-        ref_root_three_ene = 6.4906
-        thres_root_three_ene = abs(tddft_prec / ref_root_three_ene)
-
         return sn.all([
-            sn.assert_reference(total_dft_energy, ref_total_dft_energy,
-                                -thres_total_dft_energy, thres_total_dft_energy),
-            sn.assert_reference(one_e_energy, ref_one_e_energy,
-                                -thres_one_e_energy, thres_one_e_energy),
-            sn.assert_reference(coul_energy, ref_coul_energy,
-                                -thres_coul_energy, thres_coul_energy),
-            sn.assert_reference(exchange_corr, ref_exchange_corr,
-                                -thres_exchange_corr, thres_exchange_corr),
-            sn.assert_reference(nuc_rep_energy, ref_nuc_rep_energy,
-                                -thres_nuc_rep_energy, thres_nuc_rep_energy),
-            sn.assert_reference(root_one_ene, ref_root_one_ene,
-                                -thres_root_one_ene, thres_root_one_ene),
-            sn.assert_reference(root_two_ene, ref_root_two_ene,
-                                -thres_root_two_ene, thres_root_two_ene),
-            sn.assert_reference(root_three_ene, ref_root_three_ene,
-                                -thres_root_three_ene, thres_root_three_ene),
+            self._assert_energies(self._GLUCOSE_TDDFT_REFS,
+                                  self._dft_ener_thres()),
+            self._assert_energies(self._GLUCOSE_TDDFT_ROOT_REFS, tddft_prec),
         ])
 
     @deferrable
     def assert_heme6a1(self):
-        # Convergence threshold     :          1.000E-02
-        ener_thres = sn.extractsingle(r'Convergence\s+threshold\s+:\s+'
-                                      r'(?P<thres>\S+)',
-                                      self.stdout, 'thres', float,
-                                      item=-1)
-
-        # Total SCF energy =  -2545.183109542068
-        total_scf_energy = sn.extractsingle(r'Total\s+SCF\s+energy\s+=\s+'
-                                            r'(?P<energy>\S+)',
-                                            self.stdout, 'energy', float,
-                                            item=-1)
-        ref_total_scf_energy = -2545.183109542068
-        thres_total_scf_energy = abs(ener_thres / ref_total_scf_energy)
-
-        # wavefunction    = RHF
-        wave_fnc_type_start = sn.extractsingle(r'wavefunction\s+=\s+'
-                                               r'(?P<wavefn>\S+)',
-                                               self.stdout, 'wavefn',
-                                               item=0)
-
-        # wavefunction    = ROHF
-        wave_fnc_type_end = sn.extractsingle(r'wavefunction\s+=\s+'
-                                             r'(?P<wavefn>\S+)',
-                                             self.stdout, 'wavefn',
-                                             item=-1)
-
         return sn.all([
-            sn.assert_reference(total_scf_energy, ref_total_scf_energy,
-                                -thres_total_scf_energy, thres_total_scf_energy),
-            sn.assert_eq(wave_fnc_type_start, 'RHF',
+            self._assert_scf_energies(self._HEME6A1_REFS),
+            sn.assert_eq(self._field('wavefn'), 'RHF',
                          msg='Wavefunction for the first method is not RHF'),
-            sn.assert_eq(wave_fnc_type_end, 'ROHF',
+            sn.assert_eq(self._field('wavefn', item=-1), 'ROHF',
                          msg='Wavefunction for the last method is not ROHF'),
             sn.assert_found('Final ROHF results', self.stdout),
             sn.assert_found('Final eigenvalues', self.stdout),
@@ -1000,68 +669,24 @@ class nwchem_mixin(rfm.RegressionTestPlugin):
 
     @deferrable
     def assert_water_dimer(self):
-        # Convergence threshold     :          1.000E-04
-        ener_thres = sn.extractsingle(r'Convergence\s+threshold\s+:\s+'
-                                      r'(?P<thres>\S+)',
-                                      self.stdout, 'thres', float,
-                                      item=-1)
-
-        # Total SCF energy =   -151.187952037914
-        total_scf_energy = sn.extractsingle(r'Total\s+SCF\s+energy\s+=\s+'
-                                            r'(?P<energy>\S+)',
-                                            self.stdout, 'energy', float,
-                                            item=-1)
-        ref_total_scf_energy = -151.1879
-        thres_total_scf_energy = abs(ener_thres / ref_total_scf_energy)
-
-        # One-electron energy =   -283.055720556525
-        one_e_energy = sn.extractsingle(r'One-electron\s+energy\s+=\s+'
-                                        r'(?P<energy>\S+)',
-                                        self.stdout, 'energy', float,
-                                        item=-1)
-        ref_one_e_energy = -283.0557
-        thres_one_e_energy = abs(ener_thres / ref_one_e_energy)
-
-        # Two-electron energy =     94.692634711216
-        two_e_energy = sn.extractsingle(r'Two-electron\s+energy\s+=\s+'
-                                        r'(?P<energy>\S+)',
-                                        self.stdout, 'energy', float,
-                                        item=-1)
-        ref_two_e_energy = 94.6926
-        thres_two_e_energy = abs(ener_thres / ref_two_e_energy)
-
-        # Nuclear repulsion energy =     37.175133807395
-        nuc_rep_energy = sn.extractsingle(r'Nuclear\s+repulsion\s+energy\s+=\s+'
-                                        r'(?P<energy>\S+)',
-                                        self.stdout, 'energy', float,
-                                        item=-1)
-        ref_nuc_rep_energy = 37.1751
-        thres_nuc_rep_energy = abs(ener_thres / ref_nuc_rep_energy)
-
-        return sn.all([
-            sn.assert_reference(total_scf_energy, ref_total_scf_energy,
-                                -thres_total_scf_energy, thres_total_scf_energy),
-            sn.assert_reference(one_e_energy, ref_one_e_energy,
-                                -thres_one_e_energy, thres_one_e_energy),
-            sn.assert_reference(two_e_energy, ref_two_e_energy,
-                                -thres_two_e_energy, thres_two_e_energy),
-            sn.assert_reference(nuc_rep_energy, ref_nuc_rep_energy,
-                                -thres_nuc_rep_energy, thres_nuc_rep_energy),
-        ])
+        return self._assert_scf_energies(self._WATER_DIMER_REFS)
 
     @sanity_function
     def assert_sanity(self):
         '''Assert that the obtained energy meets the benchmark tolerances.'''
 
-        assert_fn_name = f'assert_{util.toalphanum(self.benchmark).lower()}'
-        assert_fn = getattr(self, assert_fn_name, None)
+        assert_fn_name = self._ASSERT_FNS.get(self.benchmark)
         sn.assert_true(
-            assert_fn is not None,
+            assert_fn_name is not None,
             msg=(f'cannot extract energy from benchmark {self.benchmark!r}: '
-                 f'please define a member function "{assert_fn_name}()"')
+                 f'please add its sanity function to "_ASSERT_FNS"')
         ).evaluate()
+
+        # A crashed run fails right away, without parsing its output
+        sn.assert_not_found('Segmentation fault', self.stderr).evaluate()
+
+        assert_fn = getattr(self, assert_fn_name)
         return sn.chain(
                sn.assert_found('CITATION', self.stdout),
-               sn.assert_not_found('Segmentation fault', self.stderr),
                assert_fn(),
             )
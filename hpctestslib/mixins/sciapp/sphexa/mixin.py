@@ -9,19 +9,23 @@ import sys
 
 import reframe as rfm
 import reframe.utility.sanity as sn
-import reframe.utility as util
 
 # Add the root directory of hpctestslib
-prefix = os.path.normpath(
-    os.path.join(os.path.abspath(os.path.dirname(__file__)), *[os.pardir, os.pardir, os.pardir])
-)
-if not prefix in sys.path:
-    sys.path = [prefix] + sys.path
+prefix = os.path.dirname(os.path.dirname(os.path.dirname(
+    os.path.dirname(os.path.abspath(__file__)))))
+if prefix not in sys.path:
+    sys.path.insert(0, prefix)
 
 
 import util as hpcutil
 
 
+# Errors of a crashed run in the stderr; a plain pattern, since
+# sn.assert_not_found does not take compiled ones
+_ERRORS_PATT = ('Segmentation fault|std::runtime_error|std::bad_alloc|'
+                'out of memory')
+
+
 # Instructions provided by Sebastian to run on Alps Daint:
 # wget --quiet -O 50c.h5 https://zenodo.org/records/8369645/files/50c.h5
 # OMP_NUM_THREADS=64 srun -N1 -c72 --ntasks-per-node=4 -c72 --gpus-per-task=1 ./sphexa-cuda --init evrard --glass 50c.h5 -n 1000 -s 5
@@ -54,41 +58,41 @@ class sphexa_mixin(rfm.RegressionTestPlugin):
         # 'turbulence'
     ])
 
-    @run_after('init')
-    def set_executable(self):
-        self.executable = 'sphexa'
+    #: Setup function of each benchmark
+    _BENCHMARK_FNS = {
+        'evrard': 'set_benchmark_evrard',
+        'turbulence': 'set_benchmark_turbulence',
+    }
 
-    @run_after('init')
-    def set_tags(self):
-        self.tags |= {'sciapp', 'physics'}
+    #: Sanity function of each benchmark
+    _ASSERT_FNS = {
+        'evrard': 'assert_evrard',
+        'turbulence': 'assert_turbulence',
+    }
 
     @run_after('init')
-    def set_descr(self):
+    def set_run_options(self):
+        self.executable = 'sphexa'
+        self.executable_opts += ['-n', f'{self.num_particles}',
+                                 '-s', f'{self.num_steps}']
+        self.tags |= {'sciapp', 'physics'}
         self.descr = f'SPH-EXA {self.benchmark} benchmark'
 
-    @run_after('init')
-    def _set_num_particles(self):
-        self.executable_opts += ['-n', f'{self.num_particles}']
-
-    @run_after('init')
-    def _set_num_steps(self):
-        self.executable_opts += ['-s', f'{self.num_steps}']
-
     @run_before('run')
     def set_benchmark_conditions(self):
-        bench_fn_name = f'set_benchmark_{util.toalphanum(self.benchmark).lower()}'
-        bench_fn = getattr(self, bench_fn_name, None)
+        bench_fn_name = self._BENCHMARK_FNS.get(self.benchmark)
         sn.assert_true(
-            bench_fn is not None,
+            bench_fn_name is not None,
             msg=(f'cannot setup benchmark {self.benchmark!r}: '
-                 f'please define a member function "{bench_fn_name}()"')
+                 f'please add its setup function to "_BENCHMARK_FNS"')
         ).evaluate()
-        bench_fn()
+        getattr(self, bench_fn_name)()
 
     def set_benchmark_evrard(self):
         self.prerun_cmds = [
             f'{hpcutil.ULIMITCMD} -c 0',
-            f'{hpcutil.CURLCMD} -LJO https://zenodo.org/records/8369645/files/50c.h5'
+            f'[ -s 50c.h5 ] || {hpcutil.CURLCMD} -LJO '
+            'https://zenodo.org/records/8369645/files/50c.h5'
         ]
         self.executable_opts += ['--init', f'{self.benchmark}',
                                 '--glass', '50c.h5']
@@ -96,7 +100,8 @@ class sphexa_mixin(rfm.RegressionTestPlugin):
     def set_benchmark_turbulence(self):
         self.prerun_cmds = [
             f'{hpcutil.ULIMITCMD} -c 0',
-            f'{hpcutil.CURLCMD} -LJO https://zenodo.org/records/8369645/files/50c.h5'
+            f'[ -s 50c.h5 ] || {hpcutil.CURLCMD} -LJO '
+            'https://zenodo.org/records/8369645/files/50c.h5'
         ]
         self.executable_opts += ['--init', f'{self.benchmark}',
                                 '--prop', f'{self.benchmark}',
@@ -106,7 +111,7 @@ class sphexa_mixin(rfm.RegressionTestPlugin):
     def perf(self):
         # === Total time for iteration(50) 3.45854s
         return sn.extractsingle(r'===\s+Total\s+time\s+for\s+iteration\S+\s+'
-                                r'(?P<perf>\S+)s',
+                                r'(?P<perf>[^\ss]+)s',
                                 self.stdout, 'perf', float, -1)
 
     def assert_sphexa(self, ref_energy):
@@ -114,7 +119,7 @@ class sphexa_mixin(rfm.RegressionTestPlugin):
         ener_thres = 1e-2
 
         ### Check ### Total energy: -0.616261, (internal: 0.049779, kinetic: 0.00067688, gravitational: -0.666717)
-        total_energy = sn.extractsingle(r'Total\s+energy:\s+(?P<energy>\S+),',
+        total_energy = sn.extractsingle(r'Total\s+energy:\s+(?P<energy>[^\s,]+),',
                                       self.stdout, 'energy', float,
                                       item=-1)
         ref_total_energy = ref_energy
@@ -144,17 +149,14 @@ class sphexa_mixin(rfm.RegressionTestPlugin):
     def assert_sanity(self):
         '''Assert that the obtained energy meets the benchmark tolerances.'''
 
-        assert_fn_name = (f'assert_{util.toalphanum(self.benchmark).lower()}')
-        assert_fn = getattr(self, assert_fn_name, None)
+        assert_fn_name = self._ASSERT_FNS.get(self.benchmark)
         sn.assert_true(
-            assert_fn is not None,
+            assert_fn_name is not None,
             msg=(f'cannot extract energy from benchmark {self.benchmark!r}: '
-                 f'please define a member function "{assert_fn_name}()"')
+                 f'please add its sanity function to "_ASSERT_FNS"')
         ).evaluate()
-        return sn.chain(
-               sn.assert_not_found('Segmentation fault', self.stderr),
-               sn.assert_not_found('std::runtime_error', self.stderr),
-               sn.assert_not_found('std::bad_alloc', self.stderr),
-               sn.assert_not_found('out of memory', self.stderr),
-               assert_fn(),
-            )
+
+        # A crashed run fails right away, without parsing its output
+        sn.assert_not_found(_ERRORS_PATT, self.stderr).evaluate()
+
+        return getattr(self, assert_fn_name)()
@@ -5,6 +5,7 @@
 
 
 # import datetime
+import math
 import os
 import re
 import sys
@@ -13,11 +14,8 @@ import reframe as rfm
 import reframe.utility.sanity as sn
 import reframe.utility as util
 
+from reframe.core.exceptions import SanityError
 
-def normalize_units(value: float, unit: str, table: dict) -> float:
-    if unit not in table:
-        raise ValueError(f"Unsupported unit: {unit}")
-    return value * table[unit]
 
 BW_MULTIPLIERS = {
     'KiB/s': 1024,
@@ -35,12 +33,52 @@ IO_MULTIPLIERS = {
     'PiB': 1024**5,
 }
 
+# Decimal, on purpose: the file size is only an approximation
+BS_MULTIPLIERS = {
+    'k': 1000,
+    'K': 1000,
+    'M': 1000**2,
+}
+
 TIME_MULTIPLIERS = {
     'msec': 1,
     'sec': 1000,
     's': 1000,
 }
 
+
+def conversion_factors(table: dict) -> dict:
+    '''Return the factor converting each unit of table to each other one'''
+    return {
+        (unit_in, unit_out): table[unit_in] / table[unit_out]
+        for unit_in in table for unit_out in table
+    }
+
+BW_FACTORS = conversion_factors(BW_MULTIPLIERS)
+IO_FACTORS = conversion_factors(IO_MULTIPLIERS)
+TIME_FACTORS = conversion_factors(TIME_MULTIPLIERS)
+
+
+def convert_units(values, output_unit: str, factors: dict):
+    '''Convert (value, unit) pairs to output_unit with a table of factors'''
+    for value, unit in values:
+        try:
+            factor = factors[unit, output_unit]
+        except KeyError:
+            raise ValueError(f'Unsupported conversion: {unit} to '
+                             f'{output_unit}') from None
+
+        yield float(value) * factor
+
+
+# Status line of the READ or WRITE group, one per fio process:
+#    READ: bw=1171MiB/s (1228MB/s), 1171MiB/s-1171MiB/s (1228MB/s-1228MB/s), io=68.6GiB (73.7GB), run=60001-60001msec
+_STATUS_RE = re.compile(rb' *(?P<group>READ|WRITE): *'
+                        rb'bw=(?P<bw>[\d.]+)(?P<bw_unit>[A-Za-z/]+)'
+                        rb'[^\n]*? io=(?P<io>[\d.]+)(?P<io_unit>[A-Za-z/]+)'
+                        rb'[^\n]*? run=[\d.]+-(?P<time>[\d.]+)'
+                        rb'(?P<time_unit>[A-Za-z/]+)')
+
 class fio_mixin(rfm.RegressionTestPlugin):
     '''
     Title: FIO benchmarks mixin
@@ -74,6 +112,9 @@ class fio_mixin(rfm.RegressionTestPlugin):
     runtime = variable(int, value=60)
     engine = variable(str, value='io_uring')
 
+    #: Status of the READ and WRITE groups, see :func:`_group_status`
+    _status = None
+
     @run_after('init')
     def set_executable(self):
         self.executable = 'fio'
@@ -86,6 +127,20 @@ class fio_mixin(rfm.RegressionTestPlugin):
     def set_descr(self):
         self.descr = f'Flexible I/O Tester {self.benchmark} benchmark'
 
+    # read and randread report a READ group, write and randwrite a WRITE one
+    @run_after('init')
+    def set_group_fns(self):
+        if 'read' in self.benchmark:
+            self._extractors = (self._extract_read_group_bw,
+                                self._extract_read_group_io,
+                                self._extract_read_group_time)
+            self._assert_fn_name = 'assert_all_reads'
+        else:
+            self._extractors = (self._extract_write_group_bw,
+                                self._extract_write_group_io,
+                                self._extract_write_group_time)
+            self._assert_fn_name = 'assert_all_writes'
+
     # Setting file_size to be depend on the other parameters
     # iodepth could be defined as a variable e.g.
     # file_size = parameter(['1G', '2G', '4G', '8G'])
@@ -100,8 +155,8 @@ class fio_mixin(rfm.RegressionTestPlugin):
         # bs=32M → 32–128G
 
         # This is an approximation
-        bs = self.block_size.replace('k', '000').replace('M', '000000')
-        self.file_size = 1000 * int(bs) * self.num_jobs
+        bs = int(self.block_size[:-1]) * BS_MULTIPLIERS[self.block_size[-1]]
+        self.file_size = 1000 * bs * self.num_jobs
 
     @run_before('run')
     def set_fio_options(self):
@@ -125,65 +180,81 @@ class fio_mixin(rfm.RegressionTestPlugin):
         ]
 
     def aggregate_bw(self, bw_list, output_unit='MiB/s'):
-        total_bytes_per_sec = sum([
-            normalize_units(float(value.group('bw')), value.group('unit'),
-                            BW_MULTIPLIERS) for value in bw_list
-        ])
-        factor = BW_MULTIPLIERS[output_unit]
-        return total_bytes_per_sec / factor, output_unit
+        total = math.fsum(convert_units(bw_list, output_unit, BW_FACTORS))
+        return total, output_unit
 
     def aggregate_io(self, io_list, output_unit='MiB'):
-        total_bytes = sum(
-            normalize_units(float(value.group('io')), value.group('unit'),
-                            IO_MULTIPLIERS) for value in io_list
-        )
-        factor = IO_MULTIPLIERS[output_unit]
-        return total_bytes / factor, output_unit
+        total = math.fsum(convert_units(io_list, output_unit, IO_FACTORS))
+        return total, output_unit
 
     def get_max_time(self, time_list, output_unit='s'):
-        runs_time = [
-            normalize_units(float(value.group('time')), value.group('unit'),
-                            TIME_MULTIPLIERS) for value in time_list
-        ]
-
-        max_run = max(runs_time)
-        factor = TIME_MULTIPLIERS[output_unit]
-        return max_run / factor, output_unit
+        max_run = max(convert_units(time_list, output_unit, TIME_FACTORS))
+        return max_run, output_unit
+
+    def _group_status(self, group):
+        '''
+        Return the status of a READ or WRITE group: the number of its status
+        lines and the (value, unit) pairs of their bandwidth, io and runtime.
+        The stdout is read once, and only the lines of the groups go through
+        the pattern; the result is reused by all the extractors and the
+        sanity check of the test.
+        '''
+        if self._status is None:
+            status = {
+                grp: {'lines': 0, 'bw': [], 'io': [], 'time': []}
+                for grp in ('READ', 'WRITE')
+            }
+            # the log is ASCII, so it is scanned as bytes and only the
+            # matched group names and units are decoded; float() takes the
+            # values as bytes
+            stdout = sn.evaluate(self.stdout)
+            try:
+                with open(stdout, 'rb') as fp:
+                    for line in fp:
+                        if b'READ:' in line:
+                            status['READ']['lines'] += 1
+                        elif b'WRITE:' in line:
+                            status['WRITE']['lines'] += 1
+                        else:
+                            continue
+
+                        match = _STATUS_RE.match(line)
+                        if match:
+                            grp_status = status[match.group('group').decode()]
+                            for value in ('bw', 'io', 'time'):
+                                grp_status[value].append(
+                                    (match.group(value),
+                                     match.group(f'{value}_unit').decode())
+                                )
+            except OSError as e:
+                raise SanityError(f'{stdout}: {e.strerror}') from e
+
+            self._status = status
+
+        return self._status[group]
 
     def _extract_read_group_bw(self):
-        found_bws = sn.findall(r'READ:\s*bw=(?P<bw>[\d.]+)(?P<unit>[A-Za-z\/]+)',
-                               self.stdout)
-        bw_sum, _ = self.aggregate_bw(found_bws)
+        bw_sum, _ = self.aggregate_bw(self._group_status('READ')['bw'])
         return bw_sum
 
     def _extract_read_group_io(self):
-        found_ios = sn.findall(r'READ:.*io=(?P<io>[\d.]+)(?P<unit>[A-Za-z\/]+)',
-                               self.stdout)
-        io_sum, _ = self.aggregate_io(found_ios)
+        io_sum, _ = self.aggregate_io(self._group_status('READ')['io'])
         return io_sum
 
     def _extract_read_group_time(self):
-        found_times = sn.findall(r'READ:.*run=[\d.]+-(?P<time>[\d.]+)(?P<unit>[A-Za-z\/]+)',
-                                self.stdout)
-        time_max, _ = self.get_max_time(found_times)
+        time_max, _ = self.get_max_time(self._group_status('READ')['time'])
         return time_max
 
     def _extract_write_group_bw(self):
-        found_bws = sn.findall(r'WRITE:\s*bw=(?P<bw>[\d.]+)(?P<unit>[A-Za-z\/]+)',
-                               self.stdout)
-        bw_sum, _ = self.aggregate_bw(found_bws)
+        bw_sum, _ = self.aggregate_bw(self._group_status('WRITE')['bw'])
         return bw_sum
 
     def _extract_write_group_io(self):
-        found_ios = sn.findall(r'WRITE:.*io=(?P<io>[\d.]+)(?P<unit>[A-Za-z\/]+)',
-                               self.stdout)
-        io_sum, _ = self.aggregate_io(found_ios)
+        io_sum, _ = self.aggregate_io(self._group_status('WRITE')['io'])
         return io_sum
 
     def _extract_write_group_time(self):
-        found_times = sn.findall(r'WRITE:.*run=[\d.]+-(?P<time>[\d.]+)(?P<unit>[A-Za-z\/]+)',
-                                self.stdout)
-        time_max, _ = self.get_max_time(found_times)
+        time_max, _ = self.get_max_time(self._group_status('WRITE')['time'])
         return time_max
 
     @run_before('performance')
@@ -192,34 +263,25 @@ class fio_mixin(rfm.RegressionTestPlugin):
         bw = 'aggregated_bw' if self.num_nodes > 1 else 'bw'
         io = 'aggregated_io' if self.num_nodes > 1 else 'io'
         rn = 'max_time' if self.num_nodes > 1 else 'time'
-        if 'read' in self.benchmark:
-            self.perf_variables[bw] = make_perf_fn(self._extract_read_group_bw, 'MiB/s')
-            self.perf_variables[io] = make_perf_fn(self._extract_read_group_io, 'MiB')
-            self.perf_variables[rn] = make_perf_fn(self._extract_read_group_time, 's')
-        else:
-            self.perf_variables[bw] = make_perf_fn(self._extract_write_group_bw, 'MiB/s')
-            self.perf_variables[io] = make_perf_fn(self._extract_write_group_io, 'MiB')
-            self.perf_variables[rn] = make_perf_fn(self._extract_write_group_time, 's')
+        bw_fn, io_fn, time_fn = self._extractors
+        self.perf_variables[bw] = make_perf_fn(bw_fn, 'MiB/s')
+        self.perf_variables[io] = make_perf_fn(io_fn, 'MiB')
+        self.perf_variables[rn] = make_perf_fn(time_fn, 's')
 
     @deferrable
     def assert_all_reads(self):
-        reads = sn.findall(r'READ:', self.stdout)
-        return sn.assert_eq(sn.count(reads), self.num_nodes,
+        return sn.assert_eq(self._group_status('READ')['lines'], self.num_nodes,
                             msg=f'Could not find all the READ lines in output')
 
     @deferrable
     def assert_all_writes(self):
-        writes = sn.findall(r'WRITE:', self.stdout)
-        return sn.assert_eq(sn.count(writes), self.num_nodes,
+        return sn.assert_eq(self._group_status('WRITE')['lines'],
+                            self.num_nodes,
                             msg=f'Could not find all the WRITE lines in output')
 
     @sanity_function
     def assert_sanity(self):
-        if 'read' in self.benchmark:
-            assert_fn_name = 'assert_all_reads'
-        else:
-            assert_fn_name = 'assert_all_writes'
-
+        assert_fn_name = self._assert_fn_name
         assert_fn = getattr(self, assert_fn_name, None)
 
         sn.assert_true(
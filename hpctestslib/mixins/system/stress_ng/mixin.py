@@ -5,6 +5,7 @@
 
 
 # import datetime
+import functools
 import os
 import re
 import sys
@@ -12,6 +13,43 @@ import sys
 import reframe as rfm
 import reframe.utility.sanity as sn
 
+from reframe.core.exceptions import SanityError
+
+
+# stress-ng: metrc: [2473] cpu               93120     10.00     80.09      0.01      9311.69        1162.54
+#
+# The template is completed with the name of the stressor by _compile
+_BOGOS_PATT = (r'stress-ng:.*metrc.*{name}\s+(?P<ops>\S+)\s+'
+               r'(?P<rtime>\S+)\s+(?P<utime>\S+)\s+'
+               r'(?P<stime>\S+)\s+(?P<ropss>\S+)\s+')
+
+# The rows of the hash, min-nanosleep and syscall tables; the group name is
+# the name of the row
+
+# stress-ng: info:  [2473] hash:          crc32c      1014456.14       0.98
+_HASH_RE = re.compile(rb'^stress-ng:[^\n]*?hash:\s+(?P<name>\S+)\s+'
+                      rb'(?P<value>\S+)\s+(?P<chi>\S+)\n', re.MULTILINE)
+
+# Row of the min-nanosleep table: sleep size, min, max and average (ns)
+_MIN_NANOSLEEP_RE = re.compile(rb'^stress-ng:[^\n]*?\s+(?P<name>\d+)\s+'
+                               rb'(?P<min>\d+)\s+(?P<max>\d+)\s+'
+                               rb'(?P<avg>\S+)\s+\n', re.MULTILINE)
+
+# stress-ng: info:  [2473] syscall: getpid         42.00        40        45
+_SYSCALL_RE = re.compile(rb'^stress-ng:[^\n]*?syscall:\s+(?P<name>\S+)\s+'
+                         rb'(?P<avg>\S+)\s+(?P<min>\S+)\s+(?P<max>\S+)\n',
+                         re.MULTILINE)
+
+# stress-ng: info:  [2473] successful run completed in 10.01 secs
+_EXECTIME_RE = re.compile(rb'stress-ng:.*successful\srun\scompleted\sin\s'
+                          rb'(?P<time>\S+)\ssec')
+
+
+@functools.lru_cache(maxsize=None)
+def _compile(patt, name):
+    '''Compile a pattern template for name, only once per name'''
+    return re.compile(patt.format(name=re.escape(name)).encode())
+
 
 class stress_ng_mixin(rfm.RegressionTestPlugin):
     '''
@@ -297,6 +335,29 @@ class stress_ng_mixin(rfm.RegressionTestPlugin):
     ])
     benchmark_time = 10
 
+    #: Extra options of the benchmarks that need them
+    _EXTRA_OPTS = {
+        # setting to display the top 1'000 fastest syscalls
+        # this makes sure that we will display everything that stress-ng
+        # chooses to share with us
+        'syscall': ['--syscall-top', '1000'],
+        'cache': ['--cache-enable-all'],
+    }
+
+    #: Benchmarks that print a table of results: the pattern of its rows,
+    #: the value of each row and its unit
+    _TABLES = {
+        'hash': (_HASH_RE, 'value', 'hashes/sec'),
+        'min-nanosleep': (_MIN_NANOSLEEP_RE, 'avg', 'ns'),
+        'syscall': (_SYSCALL_RE, 'avg', 'ns'),
+    }
+
+    #: Contents of the stdout, see :func:`_read_stdout`
+    _stdout_data = None
+
+    #: Values of the rows of the table of the benchmark, see :func:`_table`
+    _rows = None
+
     @run_after('init')
     def set_executable(self):
         self.executable = 'stress-ng'
@@ -322,75 +383,78 @@ class stress_ng_mixin(rfm.RegressionTestPlugin):
                                 f'--{self.benchmark}', f'{procs}',
                                 ]
 
-        if self.benchmark == 'syscall':
-            self.executable_opts += [
-                # setting to display the top 1'000 fastest syscalls
-                # this makes sure that we will display everything that stress-ng
-                # chooses to share with us
-                '--syscall-top', '1000'
-            ]
-        elif self.benchmark == 'cache':
-            self.executable_opts += [
-                '--cache-enable-all'
-            ]
+        self.executable_opts += self._EXTRA_OPTS.get(self.benchmark, [])
+
+    def _read_stdout(self):
+        '''
+        Return the contents of the stdout as bytes. The file is read only
+        once; all the extractors of the test match their bytes patterns on
+        the same contents.
+        '''
+        if self._stdout_data is None:
+            # the performance hooks run before reframe changes to the stage
+            # directory, so the path must not be relative
+            stdout = os.path.join(self.stagedir, sn.evaluate(self.stdout))
+            try:
+                with open(stdout, 'rb') as fp:
+                    self._stdout_data = fp.read()
+            except OSError as e:
+                raise SanityError(f'{stdout}: {e.strerror}') from e
+
+        return self._stdout_data
+
+    def _extract(self, regex, tag, conv, item=0):
+        '''Like sn.extractsingle, but with a compiled pattern'''
+        matches = list(regex.finditer(self._read_stdout()))
+
+        try:
+            return conv(matches[item].group(tag))
+        except IndexError:
+            raise SanityError(f'not enough matches of pattern '
+                              f'{regex.pattern!r} in '
+                              f'{sn.evaluate(self.stdout)!r} so as to '
+                              f'extract item {item!r}')
 
     def _extract_bogos(self):
-        return sn.extractsingle(fr'stress-ng:.*metrc.*{self.benchmark}\s+(?P<ops>\S+)\s+'
-                                r'(?P<rtime>\S+)\s+(?P<utime>\S+)\s+'
-                                r'(?P<stime>\S+)\s+(?P<ropss>\S+)\s+',
-                                self.stdout, 'ropss', float)
+        return self._extract(_compile(_BOGOS_PATT, self.benchmark),
+                             'ropss', float)
 
     def _extract_exectime(self):
-        return sn.extractsingle(r'stress-ng:.*successful\srun\scompleted\sin\s'
-                                r'(?P<time>\S+)\ssec',
-                                self.stdout, 'time', float, item=-1)
+        return self._extract(_EXECTIME_RE, 'time', float, item=-1)
+
+    def _table(self):
+        '''
+        Return the value of each row of the table of the benchmark, see
+        _TABLES, by row name. The stdout is scanned once and the result is
+        reused by the performance functions of all the rows.
+        '''
+        if self._rows is None:
+            regex, tag, _ = self._TABLES[self.benchmark]
+            rows = {}
+            for match in regex.finditer(self._read_stdout()):
+                rows.setdefault(match.group('name').decode(),
+                                match.group(tag))
 
-    def _extract_hashes(self, name):
-        return sn.extractsingle(fr'stress-ng:.*hash:\s+{name}\s+'
-                                 r'(?P<value>\S+)\s+(?P<chi>\S+)\n',
-                                    self.stdout, 'value', float)
+            self._rows = rows
 
-    def _extract_min_nanosleep(self, size):
-        return sn.extractsingle(fr'stress-ng:.*\s+{size}\s+(?P<min>\S+)'
-                                r'\s+(?P<max>\S+)\s+(?P<avg>\S+)\s+\n',
-                                self.stdout, 'avg', float)
+        return self._rows
 
-    def _extract_syscalls(self, name):
-        return sn.extractsingle(fr'stress-ng:.*syscall:\s+{name}\s+'
-                                    r'(?P<avg>\S+)\s+(?P<min>\S+)\s+'
-                                    r'(?P<max>\S+)\n',
-                                    self.stdout, 'avg', float)
+    def _extract_row(self, name):
+        return float(self._table()[name])
 
     @run_before('performance')
     def set_perf_vars(self):
         make_perf_fn = sn.make_performance_function
         self.perf_variables['exec_time'] = make_perf_fn(self._extract_exectime, 's')
         self.perf_variables['real_ops_s'] = make_perf_fn(self._extract_bogos, 'bogo ops/s')
-        if self.benchmark == 'syscall':
-            # it seems too much to performance check all the syscalls? nah! let's measure all!
-            stdout = os.path.join(self.stagedir, sn.evaluate(self.stdout))
-            syscalls=sn.extractall(r'stress-ng:.*syscall:\s+(?P<name>\S+)\s+'
-                                    r'(?P<avg>\S+)\s+(?P<min>\S+)\s+'
-                                    r'(?P<max>\S+)\n',
-                                    stdout, 'name')
-            for name in syscalls:
-                self.perf_variables[name] = make_perf_fn(self._extract_syscalls(name), 'ns')
-        elif self.benchmark == 'hash':
-            # it seems too much to performance check all the hashes? nah! let's measure all!
-            stdout = os.path.join(self.stagedir, sn.evaluate(self.stdout))
-            hashes=sn.extractall(r'stress-ng:.*hash:\s+(?P<name>\S+)\s+'
-                                 r'(?P<value>\S+)\s+(?P<chi>\S+)\n',
-                                    stdout, 'name')
-            for name in hashes:
-                self.perf_variables[name] = make_perf_fn(self._extract_hashes(name), 'hashes/sec')
-        elif self.benchmark == 'min-nanosleep':
-            # it seems too much to performance check all the hashes? nah! let's measure all!
-            stdout = os.path.join(self.stagedir, sn.evaluate(self.stdout))
-            sizes=sn.extractall(r'stress-ng:.*\s+(?P<size>\d+)\s+(?P<min>\d+)'
-                                r'\s+(?P<max>\d+)\s+(?P<avg>\S+)\s+\n',
-                                stdout, 'size')
-            for size in sizes:
-                self.perf_variables[size] = make_perf_fn(self._extract_min_nanosleep(size), 'ns')
+
+        # it seems too much to performance check all the syscalls, hashes or
+        # sleep sizes? nah! let's measure all!
+        if self.benchmark in self._TABLES:
+            _, _, unit = self._TABLES[self.benchmark]
+            for name in self._table():
+                self.perf_variables[name] = make_perf_fn(self._extract_row,
+                                                         unit, name)
 
     @sanity_function
     def assert_sanity(self):
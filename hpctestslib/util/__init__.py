@@ -3,14 +3,19 @@
 #
 # SPDX-License-Identifier: BSD-3-Clause
 
+import collections
+import concurrent.futures
+import functools
 import glob
 import grp
 import pwd
 import os
+import shutil
 import stat
 
 import reframe as rfm
 import reframe.core.runtime as rt
+import reframe.utility.sanity as sn
 import reframe.utility.osext as osext
 
 from collections.abc import MutableMapping
@@ -69,113 +74,226 @@ UNAMECMD='/bin/uname'
 UPDATECRYPTOPOLICIESCMD='/usr/bin/update-crypto-policies'
 
 
+#: The partition attributes used by the helpers below, see
+#: :func:`_partition_info`
+_PartInfo = collections.namedtuple(
+    '_PartInfo',
+    ['name', 'fullname', 'is_local', 'num_cores', 'num_sockets', 'features']
+)
+
+
+@functools.lru_cache(maxsize=1)
+def _partition_info(runtime):
+    # keyed on the runtime, so the partitions are only walked again if
+    # reframe sets up a new one
+    return tuple(
+        _PartInfo(p.name, p.fullname, p.scheduler.is_local,
+                  p.processor.num_cores, p.processor.num_sockets,
+                  frozenset(p.features))
+        for p in runtime.system.partitions
+    )
+
+
+def _partitions(avoid_local):
+    for p in _partition_info(rt.runtime()):
+        if p.is_local and avoid_local:
+            continue
+
+        yield p
+
+
 def get_first_local_partition():
-    for p in rt.runtime().system.partitions:
-        if p.scheduler.is_local:
+    for p in _partition_info(rt.runtime()):
+        if p.is_local:
             return p.fullname
     return ''
 
 
 def get_max_cpus_per_part(avoid_local=True):
-    for p in rt.runtime().system.partitions:
-        if p.scheduler.is_local and avoid_local:
-            continue
+    '''
+    Yield the cpus of each partition, using all of its cores
 
-        yield ({
+    Nothing is yielded if there are no partitions, so a test parameterized
+    on it has no variants instead of one without a partition.
+    '''
+    for p in _partitions(avoid_local):
+        yield {
             'name' : p.name,
             'fullname' : p.fullname,
-            'max_num_cores' : p.processor.num_cores,
-            'num_cores' : p.processor.num_cores,
-            'num_sockets' : p.processor.num_sockets,
-        })
-    yield {}
+            'max_num_cores' : p.num_cores,
+            'num_cores' : p.num_cores,
+            'num_sockets' : p.num_sockets,
+        }
+
+
+def _pow2_up_to(n):
+    # the powers of two below n, then n itself
+    return tuple(1 << i for i in range((n - 1).bit_length())) + (n,)
 
 
 def get_cpus_per_part(avoid_local=True):
-    for p in rt.runtime().system.partitions:
-        if p.scheduler.is_local and avoid_local:
-            continue
+    '''
+    Yield the cpus of each partition, once for every power of two below its
+    number of cores and once for all of them
 
-        nthr = 1
-        while nthr < p.processor.num_cores:
-            yield ({
-                'name' : p.name,
-                'fullname' : p.fullname,
-                'max_num_cores' : p.processor.num_cores,
-                'num_cores' : nthr,
-                'num_sockets' : p.processor.num_sockets,
-            })
-            nthr <<= 1
-
-        yield ({
+    As with :func:`get_max_cpus_per_part`, nothing is yielded if there are
+    no partitions.
+    '''
+    for p in _partitions(avoid_local):
+        num_cores = p.num_cores
+        base = {
             'name' : p.name,
             'fullname' : p.fullname,
-            'max_num_cores' : p.processor.num_cores,
-            'num_cores' : nthr,
-            'num_sockets' : p.processor.num_sockets,
-        })
-    yield {}
+            'max_num_cores' : num_cores,
+            'num_sockets' : p.num_sockets,
+        }
+        for nthr in _pow2_up_to(num_cores):
+            yield dict(base, num_cores=nthr)
 
 
-def get_partitions_with_feature_set(feature_set=set(), avoid_local=True):
-    for p in rt.runtime().system.partitions:
-        if p.scheduler.is_local and avoid_local:
-            continue
-
-        sfeat = set(p.features)
-        if feature_set.difference(sfeat):
+def get_partitions_with_feature_set(feature_set=frozenset(), avoid_local=True):
+    '''
+    Yield the full names of the partitions that have all the features in
+    feature_set; nothing is yielded if there is no such partition
+    '''
+    feature_set = frozenset(feature_set)
+    for p in _partitions(avoid_local):
+        if not feature_set.issubset(p.features):
             continue
 
         yield(p.fullname)
-    yield {}
 
 
+@functools.lru_cache(maxsize=1)
 def is_cray():
+    # the CDT version cannot change while reframe runs
     return cray_cdt_version()
 
 
-# taken from https://www.freecodecamp.org/news/how-to-flatten-a-dictionary-in-python-in-4-different-ways/
+# based on https://www.freecodecamp.org/news/how-to-flatten-a-dictionary-in-python-in-4-different-ways/
 def flatten_dict(d: MutableMapping, parent_key: str = '', sep: str ='\t') -> MutableMapping:
-    items = []
-    for k, v in d.items():
-        new_key = parent_key + sep + k if parent_key else k
-        if isinstance(v, MutableMapping):
-            items.extend(flatten_dict(v, new_key, sep=sep).items())
+    # walk the nested mappings with a stack of iterators instead of
+    # recursing, so that the keys keep their depth-first order
+    flat = {}
+    stack = [(parent_key, iter(d.items()))]
+    while stack:
+        prefix, items = stack[-1]
+        for k, v in items:
+            new_key = prefix + sep + k if prefix else k
+            if isinstance(v, MutableMapping):
+                stack.append((new_key, iter(v.items())))
+                break
+
+            flat[new_key] = v
         else:
-            items.append((new_key, v))
-    return dict(items)
+            stack.pop()
+
+    return flat
 
 
-def get_all_files_in_paths(paths, extensions=None, recursive=False):
-    def _get_file(file, extensions):
-        if extensions:
-            ext = pathlib.Path(file).suffix
-            if isinstance(extensions, list):
-                if ext in extensions:
-                    return file
+def iter_all_files_in_paths(paths, extensions=None, recursive=False,
+                            exclude_dirs=frozenset(), xdev=False,
+                            workers=None):
+    '''
+    Yield the files in paths with one of the given extensions
+
+    Directories named in exclude_dirs are not entered; with xdev, as with
+    find -xdev, neither are the ones on a different device than the path.
+    The directories are only read as the files are consumed, so a caller
+    that stops early, e.g. with any() or next(), skips the rest of the walk.
+
+    With workers, a recursive walk reads that many directories at a time in
+    a thread pool, which pays off on networked file systems such as Lustre
+    or NFS; the files are then yielded in no particular order.
+    '''
+    if not extensions:
+        exts = None
+    elif isinstance(extensions, str):
+        exts = frozenset([extensions])
+    else:
+        exts = frozenset(extensions)
+
+    exclude_dirs = frozenset(exclude_dirs)
+
+    def _list_dir(path, recurse, dev):
+        # the entries cache the file type from the directory listing, so
+        # only symlinks cost an extra stat; as with os.walk, unreadable
+        # directories are ignored and symlinked directories are not entered
+        try:
+            with os.scandir(path) as it:
+                entries = list(it)
+        except OSError:
+            return [], []
+
+        files = []
+        subdirs = []
+        for entry in entries:
+            if entry.is_dir():
+                if (recurse and not entry.is_symlink() and
+                    entry.name not in exclude_dirs and
+                    (dev is None or
+                     entry.stat(follow_symlinks=False).st_dev == dev)):
+                    subdirs.append(entry.path)
+            elif exts is None:
+                files.append(entry.path)
             else:
-                if ext == extensions:
-                    return file
-        else:
-            return file
+                # the suffix as given by pathlib, e.g. none for '.bashrc'
+                name = entry.name
+                dot = name.rfind('.')
+                if 0 < dot < len(name) - 1 and name[dot:] in exts:
+                    files.append(entry.path)
+
+        return files, subdirs
+
+    def _scan(path, recurse, dev):
+        files, subdirs = _list_dir(path, recurse, dev)
+        yield from files
+        for d in subdirs:
+            yield from _scan(d, recurse, dev)
+
+    def _scan_parallel(path, recurse, dev):
+        with concurrent.futures.ThreadPoolExecutor(workers) as pool:
+            pending = {pool.submit(_list_dir, path, recurse, dev)}
+            while pending:
+                done, pending = concurrent.futures.wait(
+                    pending, return_when=concurrent.futures.FIRST_COMPLETED
+                )
+                for future in done:
+                    files, subdirs = future.result()
+                    for d in subdirs:
+                        pending.add(pool.submit(_list_dir, d, recurse, dev))
+
+                    yield from files
 
-        return None
-    files = []
     for path in paths:
-        if os.path.isfile(path):
-            p = _get_file(path, extensions)
-            if p:
-                files.append(p)
-        else:
-            for (dirpath, _, filenames) in os.walk(path):
-                for f in filenames:
-                    p = _get_file(os.path.join(dirpath, f), extensions)
-                    if p:
-                        files.append(p)
-                if not recursive:
-                    break
+        # a single stat tells files from directories and gives the device
+        try:
+            st = os.stat(path)
+        except OSError:
+            continue
+
+        if stat.S_ISREG(st.st_mode):
+            name = os.path.basename(path)
+            dot = name.rfind('.')
+            if exts is None or (0 < dot < len(name) - 1 and
+                                name[dot:] in exts):
+                yield path
+        elif stat.S_ISDIR(st.st_mode):
+            dev = st.st_dev if xdev and recursive else None
+            if workers and recursive:
+                yield from _scan_parallel(path, recursive, dev)
+            else:
+                yield from _scan(path, recursive, dev)
 
-    return files
+
+def get_all_files_in_paths(paths, extensions=None, recursive=False,
+                           exclude_dirs=frozenset(), xdev=False,
+                           workers=None):
+    '''
+    Return the list of files yielded by :func:`iter_all_files_in_paths`
+    '''
+    return list(iter_all_files_in_paths(paths, extensions, recursive,
+                                        exclude_dirs, xdev, workers))
 
 
 class SkipIfNotLocal(rfm.RegressionTestPlugin):
@@ -209,23 +327,28 @@ class SkipIfNotRoot(rfm.RegressionTestPlugin):
 class SkipIfCmdNotFound(rfm.RegressionTestPlugin):
     @run_after('init')
     def skip_if_cmd_not_found(self):
-        try:
-            cmd_status = osext.run_command(f'{self.executable}')
-        except FileNotFoundError:
+        # look the command up in the PATH instead of running it
+        cmd = str(self.executable).split()
+        if not cmd or shutil.which(cmd[0]) is None:
             self.skip(f'{self.executable} command not found')
 
 
+_SLURM_SCHEDULERS = (SlurmJobScheduler, SqueueJobScheduler)
+
+
 class SkipIfNotSlurm(rfm.RegressionTestPlugin):
     @run_after('setup')
     def skip_if_not_slurm(self):
         sched = self.current_partition.scheduler
-        is_slurm = (isinstance(sched, SlurmJobScheduler) or
-                    isinstance(sched, SqueueJobScheduler))
-        if not is_slurm:
+        if not isinstance(sched, _SLURM_SCHEDULERS):
             self.skip('The scheduler is not Slurm')
 
 
 class GetDepMixin(rfm.RegressionTestPlugin):
+    #: Dependencies of the test case by (name, environment), see
+    #: :func:`mygetdep`
+    _dep_index = None
+
     def mygetdep(self, target, environ=None):
         '''
         Creating our own getdep because it is very difficult to depend on the
@@ -234,11 +357,17 @@ class GetDepMixin(rfm.RegressionTestPlugin):
         if environ is None:
             environ = self.current_environ.name
 
-        for d in self._case().deps:
-            mask = int(d.check.unique_name == target)
-            mask |= (int(d.environ.name == environ) | int(environ == '*')) << 1
-            if mask == 3:
-                return d.check
+        if self._dep_index is None:
+            # the first dependency wins, as in a walk over the deps; the
+            # environment '*' stands for any environment
+            index = {}
+            for d in self._case().deps:
+                index.setdefault((d.check.unique_name, d.environ.name), d.check)
+                index.setdefault((d.check.unique_name, '*'), d.check)
+
+            self._dep_index = index
+
+        return self._dep_index.get((target, environ))
 
 
 class info_protection(AbstractContextManager):
@@ -255,10 +384,16 @@ class info_protection(AbstractContextManager):
 
     def __exit__(self, exc_type, exc_value, exc_traceback):
         if exc_type:
-            with osext.change_dir(sn.evaluate(self.rfmclss.stagedir)):
-                open(sn.evaluate(self.rfmclss.stdout), 'w').close()
-                open(sn.evaluate(self.rfmclss.stderr), 'w').close()
-                for f in self.rfmclss.keep_files:
-                    open(f, 'w').close()
+            stagedir = sn.evaluate(self.rfmclss.stagedir)
+            files = [sn.evaluate(self.rfmclss.stdout),
+                     sn.evaluate(self.rfmclss.stderr),
+                     *self.rfmclss.keep_files]
+            with osext.change_dir(stagedir):
+                for f in files:
+                    # files that were never written have nothing to hide
+                    try:
+                        os.truncate(f, 0)
+                    except OSError:
+                        pass
 
         return False
\ No newline at end of file
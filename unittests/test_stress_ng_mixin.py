@@ -0,0 +1,72 @@
+# Copyright 2025-2026 Swiss National Supercomputing Centre (CSCS/ETH Zurich)
+# See the top-level LICENSE file for details.
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+import os
+import sys
+
+import pytest
+
+pytest.importorskip('reframe')
+
+import reframe.utility.sanity as sn  # noqa: E402
+
+from reframe.core.exceptions import SanityError  # noqa: E402
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(
+                os.path.abspath(__file__))), 'hpctestslib'))
+
+from mixins.system.stress_ng.mixin import stress_ng_mixin  # noqa: E402
+
+
+SYSCALL_STDOUT = '''\
+stress-ng: info:  [2473] setting to a 10 secs run per stressor
+stress-ng: info:  [2473] syscall: getpid         42.00        40        45
+stress-ng: info:  [2473] syscall: getuid         38.50        36        41
+stress-ng: metrc: [2473] syscall        93120     10.00     80.09      0.01      9311.69        1162.54
+stress-ng: info:  [2473] successful run completed in 10.01 secs
+'''
+
+
+class _stage_only_test:
+    '''
+    The state of a stress-ng test that the performance hooks use; the rest
+    is taken from stress_ng_mixin
+    '''
+
+    stdout = 'rfm_job.out'
+
+    def __init__(self, benchmark, stagedir):
+        self.benchmark = benchmark
+        self.stagedir = str(stagedir)
+        self.perf_variables = {}
+
+    def __getattr__(self, name):
+        attr = getattr(stress_ng_mixin, name)
+        if callable(attr) and hasattr(attr, '__get__'):
+            return attr.__get__(self)
+
+        return attr
+
+
+def test_perf_vars_outside_stagedir(tmp_path, monkeypatch):
+    stagedir = tmp_path / 'stage'
+    stagedir.mkdir()
+    (stagedir / 'rfm_job.out').write_text(SYSCALL_STDOUT)
+
+    # the performance hooks run before reframe changes to the stage directory
+    monkeypatch.chdir(tmp_path)
+    test = _stage_only_test('syscall', stagedir)
+    test.set_perf_vars()
+    assert {'getpid', 'getuid'} <= set(test.perf_variables)
+    assert sn.evaluate(test.perf_variables['getpid']) == 42.0
+    assert sn.evaluate(test.perf_variables['getuid']) == 38.5
+    assert sn.evaluate(test.perf_variables['exec_time']) == 10.01
+
+
+def test_perf_vars_missing_stdout(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    test = _stage_only_test('syscall', tmp_path / 'stage')
+    with pytest.raises(SanityError):
+        test.set_perf_vars()